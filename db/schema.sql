@@ -1,3 +1,6 @@
+-- Must be set before any table exists; lets the ETL reclaim space with
+-- PRAGMA incremental_vacuum instead of rewriting the file with VACUUM
+PRAGMA auto_vacuum = INCREMENTAL;
 PRAGMA foreign_keys = OFF;
 BEGIN TRANSACTION;
 
@@ -26,6 +29,11 @@ CREATE TABLE IF NOT EXISTS movies (
     created_at      TEXT DEFAULT CURRENT_TIMESTAMP
 );
 CREATE INDEX IF NOT EXISTS idx_movies_title ON movies(title);
+CREATE INDEX IF NOT EXISTS idx_movies_created_at ON movies(created_at);
+CREATE INDEX IF NOT EXISTS idx_movies_title_nocase ON movies(title COLLATE NOCASE, poster_path, tmdb_id);
+CREATE INDEX IF NOT EXISTS idx_movies_release_date ON movies(release_date DESC, title);
+CREATE INDEX IF NOT EXISTS idx_movies_year_title ON movies(release_year DESC, title)
+    WHERE overview IS NOT NULL AND overview != '';
 
 CREATE TABLE IF NOT EXISTS shows (
     show_id         INTEGER PRIMARY KEY,
@@ -42,6 +50,8 @@ CREATE TABLE IF NOT EXISTS shows (
     created_at      TEXT DEFAULT CURRENT_TIMESTAMP
 );
 CREATE INDEX IF NOT EXISTS idx_shows_title ON shows(title);
+CREATE INDEX IF NOT EXISTS idx_shows_created_at ON shows(created_at);
+CREATE INDEX IF NOT EXISTS idx_shows_title_nocase ON shows(title COLLATE NOCASE, poster_path, tmdb_id);
 
 CREATE TABLE IF NOT EXISTS seasons (
     season_id      INTEGER PRIMARY KEY,
@@ -68,17 +78,18 @@ CREATE TABLE IF NOT EXISTS genres (
     name            TEXT UNIQUE NOT NULL
 );
 
+-- Junction tables are clustered on their composite key (WITHOUT ROWID)
 CREATE TABLE IF NOT EXISTS movie_genres (
     movie_id    INTEGER NOT NULL REFERENCES movies(movie_id) ON DELETE CASCADE,
     genre_id    INTEGER NOT NULL REFERENCES genres(genre_id) ON DELETE CASCADE,
     PRIMARY KEY (movie_id, genre_id)
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS show_genres (
     show_id     INTEGER NOT NULL REFERENCES shows(show_id) ON DELETE CASCADE,
     genre_id    INTEGER NOT NULL REFERENCES genres(genre_id) ON DELETE CASCADE,
     PRIMARY KEY (show_id, genre_id)
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS people (
     person_id       INTEGER PRIMARY KEY,
@@ -93,7 +104,7 @@ CREATE TABLE IF NOT EXISTS movie_cast (
     character   TEXT,
     cast_order  INTEGER,
     PRIMARY KEY (movie_id, person_id)
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS show_cast (
     show_id     INTEGER NOT NULL REFERENCES shows(show_id) ON DELETE CASCADE,
@@ -101,7 +112,7 @@ CREATE TABLE IF NOT EXISTS show_cast (
     character   TEXT,
     cast_order  INTEGER,
     PRIMARY KEY (show_id, person_id)
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS reviews (
     review_id   INTEGER PRIMARY KEY,
@@ -115,6 +126,8 @@ CREATE TABLE IF NOT EXISTS reviews (
 );
 CREATE INDEX IF NOT EXISTS idx_reviews_movie ON reviews(movie_id);
 CREATE INDEX IF NOT EXISTS idx_reviews_show ON reviews(show_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_user_movie ON reviews(user_id, movie_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_user_show ON reviews(user_id, show_id);
 -- Note: Unique constraint for one review per user per movie/show is enforced in backend
 -- SQLite doesn't support partial unique indexes, so we check in application code
 
@@ -5,26 +5,132 @@ Extracts data from TMDb API, applies quality filters, and loads into database
 """
 from __future__ import annotations
 
+import json
 import logging
 import os
+import queue
+import random
 import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 
 API_BASE = "https://api.themoviedb.org/3"
 
+# Translation table that drops null bytes (they can cause SQLite issues)
+_NULL_TABLE = str.maketrans('', '', '\x00')
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to cap the overall API request rate
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
 
 class TMDbETLService:
     """
     Enhanced ETL service with data cleaning, transformation, and quality checks
     """
     
+    # Upsert statements are shared class constants so every call passes the
+    # same SQL text and hits the connection's prepared-statement cache
+    _SQL_UPSERT_PERSON = """
+        INSERT INTO people (
+            tmdb_person_id, name, profile_path, birthday, deathday,
+            place_of_birth, biography, imdb_id, instagram_id, twitter_id, facebook_id
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(tmdb_person_id) DO UPDATE SET
+            name = excluded.name,
+            profile_path = excluded.profile_path,
+            birthday = COALESCE(excluded.birthday, birthday),
+            deathday = COALESCE(excluded.deathday, deathday),
+            place_of_birth = COALESCE(excluded.place_of_birth, place_of_birth),
+            biography = COALESCE(excluded.biography, biography),
+            imdb_id = COALESCE(excluded.imdb_id, imdb_id),
+            instagram_id = COALESCE(excluded.instagram_id, instagram_id),
+            twitter_id = COALESCE(excluded.twitter_id, twitter_id),
+            facebook_id = COALESCE(excluded.facebook_id, facebook_id)
+    """
+    
+    _SQL_LINK_MOVIE_GENRE = """
+        INSERT OR IGNORE INTO movie_genres (movie_id, genre_id) VALUES (?, ?)
+    """
+    
+    _SQL_LINK_SHOW_GENRE = """
+        INSERT OR IGNORE INTO show_genres (show_id, genre_id) VALUES (?, ?)
+    """
+    
+    _SQL_ATTACH_MOVIE_CAST = """
+        INSERT INTO movie_cast (movie_id, person_id, character, cast_order)
+        VALUES (
+            (SELECT movie_id FROM movies WHERE tmdb_id = ?),
+            (SELECT person_id FROM people WHERE tmdb_person_id = ?),
+            ?, ?
+        )
+        ON CONFLICT(movie_id, person_id) DO UPDATE SET
+            character = excluded.character,
+            cast_order = excluded.cast_order
+    """
+    
+    _SQL_ATTACH_SHOW_CAST = """
+        INSERT INTO show_cast (show_id, person_id, character, cast_order)
+        VALUES (
+            (SELECT show_id FROM shows WHERE tmdb_id = ?),
+            (SELECT person_id FROM people WHERE tmdb_person_id = ?),
+            ?, ?
+        )
+        ON CONFLICT(show_id, person_id) DO UPDATE SET
+            character = excluded.character,
+            cast_order = excluded.cast_order
+    """
+    
+    _SQL_UPSERT_SEASON_ROW = """
+        INSERT INTO seasons (show_id, season_number, title, air_date)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(show_id, season_number) DO UPDATE SET
+            title = excluded.title,
+            air_date = excluded.air_date
+    """
+    
+    _SQL_UPSERT_EPISODE_ROW = """
+        INSERT INTO episodes (season_id, episode_number, title, air_date, runtime_min)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(season_id, episode_number) DO UPDATE SET
+            title = excluded.title,
+            air_date = excluded.air_date,
+            runtime_min = excluded.runtime_min
+    """
+    
     def __init__(self, config: dict):
         """Initialize the ETL service with configuration"""
         load_dotenv()
@@ -65,26 +171,121 @@ class TMDbETLService:
             'errors': 0,
         }
         
-        # HTTP session for connection pooling
-        self.session = requests.Session()
+        # Guards stats updated from concurrent API fetches
+        self._stats_lock = threading.Lock()
+        
+        # HTTP session for connection pooling, sized for concurrent fetches
+        api_config = config.get('api', {})
+        self.max_workers = api_config.get('max_workers', 8)
+        self.session = self._create_session(
+            api_config.get('http_cache_hours', 0),
+            api_config.get('http_cache_list_minutes', 5),
+        )
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        
+        # Thread pool for prefetching person/season details and a global
+        # rate limit shared by all fetching threads
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix='tmdb-fetch'
+        )
+        requests_per_second = api_config.get('requests_per_second', 40)
+        self.rate_limiter = TokenBucket(requests_per_second) if requests_per_second > 0 else None
     
-        # Cache for person details to avoid redundant API calls
+        # Cache for person details to avoid redundant API calls.
+        # In-memory dict (L1) backed by a person_cache table (L2) that
+        # survives across ETL runs.
         self._person_cache = {}
+        self._person_cache_conn: Optional[sqlite3.Connection] = None
+        self._person_cache_lock = threading.Lock()
+        self.person_cache_ttl = config.get('api', {}).get('person_cache_ttl_days', 30) * 86400
+        
+        # tmdb_genre_id -> genre_id, loaded after sync_genres (or on first use)
+        self._genre_map: Optional[Dict[int, int]] = None
+    
+    def _create_session(self, cache_hours: float, list_cache_minutes: float = 5) -> requests.Session:
+        """
+        Create the HTTP session, backed by an on-disk response cache when
+        http_cache_hours is set and requests-cache is installed
+        
+        Discover and popular list pages reorder often, so they expire after
+        list_cache_minutes instead of the full cache_hours.
+        """
+        if cache_hours > 0:
+            try:
+                import requests_cache
+            except ImportError:
+                self.logger.warning(
+                    "api.http_cache_hours is set but requests-cache is not installed; "
+                    "install it with: pip install requests-cache"
+                )
+            else:
+                # api_key is ignored for matching and redacted from the cache
+                cache_path = str(Path(self.db_path).with_name('tmdb_http_cache.sqlite'))
+                return requests_cache.CachedSession(
+                    cache_path,
+                    backend='sqlite',
+                    expire_after=int(cache_hours * 3600),
+                    urls_expire_after={
+                        '*/discover/*': int(list_cache_minutes * 60),
+                        '*/popular': int(list_cache_minutes * 60),
+                    },
+                    cache_control=True,
+                    allowable_methods=('GET',),
+                    ignored_parameters=['api_key'],
+                )
+        return requests.Session()
     
     def _get_db_connection(self) -> sqlite3.Connection:
         """Get a database connection"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        # isolation_level=None disables the sqlite3 module's implicit BEGIN;
+        # write batches use explicit transactions via _transaction().
+        # check_same_thread=False lets the background writer thread use the
+        # connection; only one thread writes through it at a time.
+        conn = sqlite3.connect(
+            self.db_path, timeout=30.0, isolation_level=None, cached_statements=256,
+            check_same_thread=False
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON")
         
+        self._configure_connection(conn)
+        
+        # Checkpoint less often so bulk loads don't stall mid-run
+        conn.execute("PRAGMA wal_autocheckpoint = 10000")
+        
+        return conn
+    
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply performance PRAGMAs to a connection"""
         # Set busy timeout to handle concurrent access (30 seconds)
         conn.execute("PRAGMA busy_timeout = 30000")
         
-        # Enable WAL mode if configured
+        # Enable WAL mode if configured; NORMAL sync is only durable under WAL
         if self.config.get('database', {}).get('enable_wal', True):
             conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
         
-        return conn
+        # 64 MB page cache, in-memory temp tables and memory-mapped reads
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 2147483648")
+    
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection):
+        """Run a block of writes inside a single BEGIN IMMEDIATE transaction"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def _add_stat(self, key: str, amount: int = 1):
+        """Increment a stats counter; worker and writer threads update stats concurrently"""
+        with self._stats_lock:
+            self.stats[key] += amount
     
     def _api_get(self, path: str, **params) -> dict:
         """Make API request with retry logic and rate limiting"""
@@ -98,35 +299,47 @@ class TMDbETLService:
         
         for attempt in range(max_retries):
             try:
-                # Rate limiting
-                if request_delay > 0:
+                # Rate limiting (retries have already waited out their backoff)
+                if request_delay > 0 and attempt == 0:
                     time.sleep(request_delay)
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
                 
                 resp = self.session.get(url, params=params, timeout=timeout)
                 resp.raise_for_status()
                 
-                self.stats['api_calls'] += 1
+                # Responses served from the HTTP cache don't count as API calls
+                if not getattr(resp, 'from_cache', False):
+                    self._add_stat('api_calls')
                 return resp.json()
                 
             except requests.exceptions.RequestException as e:
                 self.logger.warning(f"API request failed (attempt {attempt + 1}/{max_retries}): {e}")
                 
                 if attempt == max_retries - 1:
-                    self.stats['errors'] += 1
+                    self._add_stat('errors')
                     raise
                 
-                # Exponential backoff
-                time.sleep(2 ** attempt)
+                # Honor Retry-After on 429, otherwise jittered exponential backoff
+                backoff = 2 ** attempt
+                resp = getattr(e, 'response', None)
+                if resp is not None and resp.status_code == 429:
+                    try:
+                        backoff = int(resp.headers.get('Retry-After', backoff))
+                    except (TypeError, ValueError):
+                        pass
+                time.sleep(backoff + random.uniform(0, 0.5))
         
         return {}
     
     def _ensure_schema_columns(self, conn: sqlite3.Connection):
         """Ensure all required columns exist in the database"""
         def has_column(table: str, column: str) -> bool:
-            rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-            return any(row['name'] == column for row in rows)
+            return conn.execute(
+                "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1", (table, column)
+            ).fetchone() is not None
         
-        with conn:
+        with self._transaction(conn):
             # Movies table columns
             if not has_column('movies', 'backdrop_path'):
                 conn.execute("ALTER TABLE movies ADD COLUMN backdrop_path TEXT")
@@ -158,35 +371,165 @@ class TMDbETLService:
                 conn.execute("ALTER TABLE people ADD COLUMN twitter_id TEXT")
             if not has_column('people', 'facebook_id'):
                 conn.execute("ALTER TABLE people ADD COLUMN facebook_id TEXT")
+            
+            # Indexes backing cleanup_stale_data's created_at range deletes
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_movies_created_at ON movies(created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_shows_created_at ON shows(created_at)")
+            
+            # Covering indexes for diagnose_images' title-ordered catalog scan
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_movies_title_nocase "
+                "ON movies(title COLLATE NOCASE, poster_path, tmdb_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_shows_title_nocase "
+                "ON shows(title COLLATE NOCASE, poster_path, tmdb_id)"
+            )
+            
+            # Lets release-date ordered scans read movies in index order
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_movies_release_date ON movies(release_date DESC, title)"
+            )
+            # Partial index over the titles the catalog lists (non-empty overview),
+            # ordered for year-then-title browsing
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_movies_year_title ON movies(release_year DESC, title) "
+                "WHERE overview IS NOT NULL AND overview != ''"
+            )
+            
+            self._migrate_junction_tables(conn)
+        
+        # vacuum_database relies on incremental auto-vacuum; older databases
+        # need a single full VACUUM (done by vacuum_database) to switch modes
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0:
+            self.logger.info(
+                "Database uses auto_vacuum=NONE; the next vacuum_database() run "
+                "will perform a one-time VACUUM to enable incremental vacuuming"
+            )
+    
+    # Composite-key junction tables stored WITHOUT ROWID (see db/schema.sql)
+    _JUNCTION_TABLES = ('movie_genres', 'show_genres', 'movie_cast', 'show_cast')
+    
+    def _migrate_junction_tables(self, conn: sqlite3.Connection):
+        """Rebuild junction tables created before they were WITHOUT ROWID"""
+        for table in self._JUNCTION_TABLES:
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            if not row or 'WITHOUT ROWID' in row['sql'].upper():
+                continue
+            
+            # Reuse the stored column definitions (including ALTERed columns)
+            columns = row['sql'][row['sql'].index('('):]
+            # DROP TABLE takes the table's secondary indexes with it; keep their
+            # DDL (autoindexes have no sql) so they can be recreated on the rebuild
+            index_ddl = [
+                index_row['sql'] for index_row in conn.execute(
+                    "SELECT sql FROM sqlite_master "
+                    "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                    (table,)
+                )
+            ]
+            conn.execute(f"CREATE TABLE {table}__new {columns} WITHOUT ROWID")
+            conn.execute(f"INSERT INTO {table}__new SELECT * FROM {table}")
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {table}__new RENAME TO {table}")
+            for sql in index_ddl:
+                conn.execute(sql)
+            self.logger.info(f"Rebuilt {table} as a WITHOUT ROWID table")
+    
+    def _get_person_cache_conn(self) -> sqlite3.Connection:
+        """Get the connection backing the persistent person cache"""
+        if self._person_cache_conn is None:
+            # Autocommit so cache writes never hold a transaction open; shared
+            # by the fetch threads under _person_cache_lock
+            conn = sqlite3.connect(
+                self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            self._configure_connection(conn)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS person_cache (
+                    tmdb_person_id  INTEGER PRIMARY KEY,
+                    data            TEXT NOT NULL,
+                    fetched_at      INTEGER NOT NULL
+                )
+                """
+            )
+            self._person_cache_conn = conn
+        return self._person_cache_conn
     
     def _fetch_person_details(self, tmdb_person_id: int) -> dict:
         """Fetch full person details including biography and external IDs"""
         if tmdb_person_id in self._person_cache:
             return self._person_cache[tmdb_person_id]
         
+        # Check the persistent cache before hitting the API
+        now = int(time.time())
+        try:
+            with self._person_cache_lock:
+                row = self._get_person_cache_conn().execute(
+                    "SELECT data FROM person_cache WHERE tmdb_person_id = ? AND fetched_at > ?",
+                    (tmdb_person_id, now - self.person_cache_ttl)
+                ).fetchone()
+            if row:
+                person_data = json.loads(row[0])
+                self._person_cache[tmdb_person_id] = person_data
+                return person_data
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.warning(f"Person cache lookup failed for {tmdb_person_id}: {e}")
+        
         try:
             person_data = self._api_get(
                 f'/person/{tmdb_person_id}',
                 append_to_response='external_ids'
             )
             self._person_cache[tmdb_person_id] = person_data
+            
+            try:
+                with self._person_cache_lock:
+                    self._get_person_cache_conn().execute(
+                        """
+                        INSERT INTO person_cache (tmdb_person_id, data, fetched_at)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT(tmdb_person_id) DO UPDATE SET
+                            data = excluded.data,
+                            fetched_at = excluded.fetched_at
+                        """,
+                        (tmdb_person_id, json.dumps(person_data), now)
+                    )
+            except sqlite3.Error as e:
+                self.logger.warning(f"Could not cache details for person {tmdb_person_id}: {e}")
+            
             return person_data
         except Exception as e:
             self.logger.warning(f"Could not fetch details for person {tmdb_person_id}: {e}")
             return {}
     
+    def _prefetch_people(self, cast_list: List[dict]) -> Dict[int, dict]:
+        """Fetch person details for a cast list concurrently, keyed by person ID"""
+        person_ids = list(dict.fromkeys(cast.get('id') for cast in cast_list))
+        details = dict(zip(person_ids, self._executor.map(self._fetch_person_details, person_ids)))
+        
+        person_details_map = {}
+        for cast in cast_list:
+            person_details = details[cast.get('id')]
+            # Merge cast info with person details
+            person_details.update({
+                'id': cast.get('id'),
+                'name': cast.get('name'),
+                'profile_path': cast.get('profile_path'),
+            })
+            person_details_map[cast.get('id')] = person_details
+        return person_details_map
+    
     def _clean_text(self, text: Optional[str]) -> Optional[str]:
         """Clean and normalize text data"""
         if not text:
             return None
         
-        # Strip whitespace
-        text = text.strip()
-        
-        # Remove null bytes that can cause SQLite issues
-        text = text.replace('\x00', '')
-        
-        return text if text else None
+        # Remove null bytes and strip whitespace in a single pass
+        return text.translate(_NULL_TABLE).strip() or None
     
     def _validate_movie_data(self, data: dict) -> bool:
         """Validate movie data meets quality standards"""
@@ -286,27 +629,28 @@ class TMDbETLService:
             
             all_genres = {g['id']: g for g in movie_genres + tv_genres}.values()
             
-            with conn:
-                for genre in all_genres:
-                    conn.execute(
-                        """
-                        INSERT INTO genres (tmdb_genre_id, name)
-                        VALUES (?, ?)
-                        ON CONFLICT(tmdb_genre_id) DO UPDATE SET name = excluded.name
-                        """,
-                        (genre['id'], self._clean_text(genre['name']))
-                    )
+            with self._transaction(conn):
+                conn.executemany(
+                    """
+                    INSERT INTO genres (tmdb_genre_id, name)
+                    VALUES (?, ?)
+                    ON CONFLICT(tmdb_genre_id) DO UPDATE SET name = excluded.name
+                    """,
+                    [(genre['id'], self._clean_text(genre['name'])) for genre in all_genres]
+                )
+            
+            self._load_genre_map(conn)
             
             self.stats['genres_synced'] = len(all_genres)
             self.logger.info(f"Synced {len(all_genres)} genres")
             
         except Exception as e:
             self.logger.error(f"Failed to sync genres: {e}")
-            self.stats['errors'] += 1
+            self._add_stat('errors')
     
-    def _upsert_movie(self, conn: sqlite3.Connection, movie_data: dict):
-        """Insert or update a movie"""
-        params = (
+    def _movie_params(self, movie_data: dict) -> tuple:
+        """Build the movies row parameters for a movie"""
+        return (
             movie_data['tmdb_id'],
             movie_data['title'],
             movie_data['release_year'],
@@ -319,44 +663,10 @@ class TMDbETLService:
             movie_data['tmdb_vote_avg'],
             movie_data['popularity'],
         )
-        
-        cursor = conn.execute(
-            """
-            INSERT INTO movies (
-                tmdb_id, title, release_year, release_date, runtime_min, overview, poster_path,
-                backdrop_path, original_language, tmdb_vote_avg, popularity
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(tmdb_id) DO UPDATE SET
-                title = excluded.title,
-                release_year = excluded.release_year,
-                release_date = excluded.release_date,
-                runtime_min = excluded.runtime_min,
-                overview = excluded.overview,
-                poster_path = excluded.poster_path,
-                backdrop_path = excluded.backdrop_path,
-                original_language = excluded.original_language,
-                tmdb_vote_avg = excluded.tmdb_vote_avg,
-                popularity = excluded.popularity
-            """,
-            params
-        )
-        
-        # Track if this was an insert or update
-        if cursor.rowcount > 0:
-            # Check if it was an update by seeing if the movie already existed
-            existing = conn.execute(
-                "SELECT movie_id FROM movies WHERE tmdb_id = ? AND movie_id != ?",
-                (movie_data['tmdb_id'], cursor.lastrowid)
-            ).fetchone()
-            
-            if existing:
-                self.stats['movies_updated'] += 1
-            else:
-                self.stats['movies_inserted'] += 1
     
-    def _upsert_show(self, conn: sqlite3.Connection, show_data: dict):
-        """Insert or update a TV show"""
-        params = (
+    def _show_params(self, show_data: dict) -> tuple:
+        """Build the shows row parameters for a TV show"""
+        return (
             show_data['tmdb_id'],
             show_data['title'],
             show_data['first_air_date'],
@@ -368,128 +678,149 @@ class TMDbETLService:
             show_data['tmdb_vote_avg'],
             show_data['popularity'],
         )
+    
+    # Column order of _movie_params/_show_params, used to stage batch merges
+    _MERGE_COLUMNS = {
+        'movies': (
+            'tmdb_id', 'title', 'release_year', 'release_date', 'runtime_min', 'overview',
+            'poster_path', 'backdrop_path', 'original_language', 'tmdb_vote_avg', 'popularity',
+        ),
+        'shows': (
+            'tmdb_id', 'title', 'first_air_date', 'last_air_date', 'overview', 'poster_path',
+            'backdrop_path', 'original_language', 'tmdb_vote_avg', 'popularity',
+        ),
+    }
+    
+    def _merge_staged(self, conn: sqlite3.Connection, table: str, rows: List[tuple]) -> int:
+        """
+        Bulk upsert movies or shows rows through a TEMP staging table
         
-        cursor = conn.execute(
+        Rows are loaded with executemany and merged into the target with a
+        single INSERT ... SELECT ... ON CONFLICT statement. Returns the number
+        of rows that were newly inserted.
+        """
+        columns = self._MERGE_COLUMNS[table]
+        column_list = ', '.join(columns)
+        stage = f"stage_{table}"
+        
+        # Recreate the staging table for every batch
+        conn.execute(f"DROP TABLE IF EXISTS temp.{stage}")
+        conn.execute(
+            f"CREATE TEMP TABLE {stage} AS SELECT {column_list} FROM main.{table} WHERE 0"
+        )
+        conn.executemany(
+            f"INSERT INTO temp.{stage} VALUES ({', '.join('?' for _ in columns)})", rows
+        )
+        
+        existing = conn.execute(
+            f"""
+            SELECT COUNT(*) FROM temp.{stage}
+            WHERE tmdb_id IN (SELECT tmdb_id FROM main.{table})
+            """
+        ).fetchone()[0]
+        
+        # WHERE true keeps the parser from reading ON CONFLICT as a join clause
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns[1:])
+        conn.execute(
+            f"""
+            INSERT INTO main.{table} ({column_list})
+            SELECT {column_list} FROM temp.{stage} WHERE true
+            ON CONFLICT(tmdb_id) DO UPDATE SET {updates}
             """
-            INSERT INTO shows (
-                tmdb_id, title, first_air_date, last_air_date, overview, poster_path,
-                backdrop_path, original_language, tmdb_vote_avg, popularity
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(tmdb_id) DO UPDATE SET
-                title = excluded.title,
-                first_air_date = excluded.first_air_date,
-                last_air_date = excluded.last_air_date,
-                overview = excluded.overview,
-                poster_path = excluded.poster_path,
-                backdrop_path = excluded.backdrop_path,
-                original_language = excluded.original_language,
-                tmdb_vote_avg = excluded.tmdb_vote_avg,
-                popularity = excluded.popularity
-            """,
-            params
         )
+        conn.execute(f"DROP TABLE temp.{stage}")
         
-        if cursor.rowcount > 0:
-            existing = conn.execute(
-                "SELECT show_id FROM shows WHERE tmdb_id = ? AND show_id != ?",
-                (show_data['tmdb_id'], cursor.lastrowid)
-            ).fetchone()
-            
-            if existing:
-                self.stats['shows_updated'] += 1
-            else:
-                self.stats['shows_inserted'] += 1
+        return len(rows) - existing
     
-    def _upsert_person(self, conn: sqlite3.Connection, person_data: dict):
-        """Insert or update a person with extended details"""
+    def _person_params(self, person_data: dict) -> tuple:
+        """Build the people row parameters for a person"""
         # Extract external IDs if present
         external_ids = person_data.get('external_ids', {})
         
-        conn.execute(
-            """
-            INSERT INTO people (
-                tmdb_person_id, name, profile_path, birthday, deathday,
-                place_of_birth, biography, imdb_id, instagram_id, twitter_id, facebook_id
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(tmdb_person_id) DO UPDATE SET
-                name = excluded.name,
-                profile_path = excluded.profile_path,
-                birthday = COALESCE(excluded.birthday, birthday),
-                deathday = COALESCE(excluded.deathday, deathday),
-                place_of_birth = COALESCE(excluded.place_of_birth, place_of_birth),
-                biography = COALESCE(excluded.biography, biography),
-                imdb_id = COALESCE(excluded.imdb_id, imdb_id),
-                instagram_id = COALESCE(excluded.instagram_id, instagram_id),
-                twitter_id = COALESCE(excluded.twitter_id, twitter_id),
-                facebook_id = COALESCE(excluded.facebook_id, facebook_id)
-            """,
-            (
-                person_data.get('id'),
-                self._clean_text(person_data.get('name')),
-                person_data.get('profile_path'),
-                person_data.get('birthday'),
-                person_data.get('deathday'),
-                self._clean_text(person_data.get('place_of_birth')),
-                self._clean_text(person_data.get('biography')),
-                external_ids.get('imdb_id'),
-                external_ids.get('instagram_id'),
-                external_ids.get('twitter_id'),
-                external_ids.get('facebook_id')
-            )
+        return (
+            person_data.get('id'),
+            self._clean_text(person_data.get('name')),
+            person_data.get('profile_path'),
+            person_data.get('birthday'),
+            person_data.get('deathday'),
+            self._clean_text(person_data.get('place_of_birth')),
+            self._clean_text(person_data.get('biography')),
+            external_ids.get('imdb_id'),
+            external_ids.get('instagram_id'),
+            external_ids.get('twitter_id'),
+            external_ids.get('facebook_id')
+        )
+    
+    def _upsert_people(self, conn: sqlite3.Connection, people: List[dict]):
+        """Insert or update a batch of people with extended details"""
+        conn.executemany(
+            self._SQL_UPSERT_PERSON,
+            [self._person_params(person_data) for person_data in people]
         )
-        self.stats['people_synced'] += 1
+    
+    def _load_genre_map(self, conn: sqlite3.Connection):
+        """Cache the tmdb_genre_id -> genre_id mapping"""
+        self._genre_map = {
+            row[0]: row[1]
+            for row in conn.execute("SELECT tmdb_genre_id, genre_id FROM genres")
+        }
+    
+    def _genre_ids(self, conn: sqlite3.Connection, genres: List[dict]) -> List[int]:
+        """Resolve TMDb genres to local genre_ids, skipping unknown genres"""
+        if self._genre_map is None:
+            self._load_genre_map(conn)
+        return [
+            self._genre_map[genre.get('id')]
+            for genre in genres or []
+            if genre.get('id') in self._genre_map
+        ]
     
     def _link_movie_genres(self, conn: sqlite3.Connection, movie_tmdb_id: int, genres: List[dict]):
         """Link genres to a movie"""
-        for genre in genres or []:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO movie_genres (movie_id, genre_id)
-                SELECT m.movie_id, g.genre_id
-                FROM movies m, genres g
-                WHERE m.tmdb_id = ? AND g.tmdb_genre_id = ?
-                """,
-                (movie_tmdb_id, genre.get('id'))
+        genre_ids = self._genre_ids(conn, genres)
+        if not genre_ids:
+            return
+        
+        row = conn.execute(
+            "SELECT movie_id FROM movies WHERE tmdb_id = ?", (movie_tmdb_id,)
+        ).fetchone()
+        if row:
+            conn.executemany(
+                self._SQL_LINK_MOVIE_GENRE, [(row[0], genre_id) for genre_id in genre_ids]
             )
     
     def _link_show_genres(self, conn: sqlite3.Connection, show_tmdb_id: int, genres: List[dict]):
         """Link genres to a show"""
-        for genre in genres or []:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO show_genres (show_id, genre_id)
-                SELECT s.show_id, g.genre_id
-                FROM shows s, genres g
-                WHERE s.tmdb_id = ? AND g.tmdb_genre_id = ?
-                """,
-                (show_tmdb_id, genre.get('id'))
+        genre_ids = self._genre_ids(conn, genres)
+        if not genre_ids:
+            return
+        
+        row = conn.execute(
+            "SELECT show_id FROM shows WHERE tmdb_id = ?", (show_tmdb_id,)
+        ).fetchone()
+        if row:
+            conn.executemany(
+                self._SQL_LINK_SHOW_GENRE, [(row[0], genre_id) for genre_id in genre_ids]
             )
     
-    def _attach_movie_cast(self, conn: sqlite3.Connection, movie_tmdb_id: int, cast: dict):
-        """Attach cast member to a movie"""
-        conn.execute(
-            """
-            INSERT INTO movie_cast (movie_id, person_id, character, cast_order)
-            VALUES (
-                (SELECT movie_id FROM movies WHERE tmdb_id = ?),
-                (SELECT person_id FROM people WHERE tmdb_person_id = ?),
-                ?, ?
-            )
-            ON CONFLICT(movie_id, person_id) DO UPDATE SET
-                character = excluded.character,
-                cast_order = excluded.cast_order
-            """,
-            (
-                movie_tmdb_id,
-                cast.get('id'),
-                self._clean_text(cast.get('character')),
-                cast.get('order')
-            )
+    def _attach_movie_cast_many(self, conn: sqlite3.Connection, movie_tmdb_id: int,
+                                cast_list: List[dict]):
+        """Attach a batch of cast members to a movie"""
+        conn.executemany(
+            self._SQL_ATTACH_MOVIE_CAST,
+            [
+                (
+                    movie_tmdb_id,
+                    cast.get('id'),
+                    self._clean_text(cast.get('character')),
+                    cast.get('order')
+                )
+                for cast in cast_list
+            ]
         )
     
-    def _attach_show_cast(self, conn: sqlite3.Connection, show_tmdb_id: int, cast: dict):
-        """Attach cast member to a show"""
+    def _show_cast_params(self, show_tmdb_id: int, cast: dict) -> tuple:
+        """Build the show_cast row parameters for a cast member"""
         # Handle different cast data structures
         character = cast.get('character')
         if not character and cast.get('roles'):
@@ -499,75 +830,57 @@ class TMDbETLService:
         if cast_order is None:
             cast_order = cast.get('total_episode_count')
         
-        conn.execute(
-            """
-            INSERT INTO show_cast (show_id, person_id, character, cast_order)
-            VALUES (
-                (SELECT show_id FROM shows WHERE tmdb_id = ?),
-                (SELECT person_id FROM people WHERE tmdb_person_id = ?),
-                ?, ?
-            )
-            ON CONFLICT(show_id, person_id) DO UPDATE SET
-                character = excluded.character,
-                cast_order = excluded.cast_order
-            """,
-            (
-                show_tmdb_id,
-                cast.get('id'),
-                self._clean_text(character),
-                cast_order
-            )
+        return (
+            show_tmdb_id,
+            cast.get('id'),
+            self._clean_text(character),
+            cast_order
         )
     
-    def _upsert_season(self, conn: sqlite3.Connection, show_tmdb_id: int, season: dict):
-        """Insert or update a season"""
-        conn.execute(
-            """
-            INSERT INTO seasons (show_id, season_number, title, air_date)
-            VALUES (
-                (SELECT show_id FROM shows WHERE tmdb_id = ?),
-                ?, ?, ?
-            )
-            ON CONFLICT(show_id, season_number) DO UPDATE SET
-                title = excluded.title,
-                air_date = excluded.air_date
-            """,
-            (
-                show_tmdb_id,
-                season.get('season_number'),
-                self._clean_text(season.get('name')),
-                season.get('air_date')
-            )
+    def _attach_show_cast_many(self, conn: sqlite3.Connection, show_tmdb_id: int,
+                               cast_list: List[dict]):
+        """Attach a batch of cast members to a show"""
+        conn.executemany(
+            self._SQL_ATTACH_SHOW_CAST,
+            [self._show_cast_params(show_tmdb_id, cast) for cast in cast_list]
         )
     
-    def _upsert_episode(self, conn: sqlite3.Connection, show_tmdb_id: int, 
-                        season_number: int, episode: dict):
-        """Insert or update an episode"""
-        conn.execute(
-            """
-            INSERT INTO episodes (season_id, episode_number, title, air_date, runtime_min)
-            VALUES (
+    def _upsert_seasons(self, conn: sqlite3.Connection, show_tmdb_id: int,
+                        seasons: List[dict]) -> Dict[int, int]:
+        """Insert or update a show's seasons; returns season_number -> season_id"""
+        show_pk = conn.execute(
+            "SELECT show_id FROM shows WHERE tmdb_id = ?", (show_tmdb_id,)
+        ).fetchone()[0]
+        
+        conn.executemany(
+            self._SQL_UPSERT_SEASON_ROW,
+            [
                 (
-                    SELECT season_id
-                    FROM seasons
-                    WHERE show_id = (SELECT show_id FROM shows WHERE tmdb_id = ?)
-                      AND season_number = ?
-                ),
-                ?, ?, ?, ?
-            )
-            ON CONFLICT(season_id, episode_number) DO UPDATE SET
-                title = excluded.title,
-                air_date = excluded.air_date,
-                runtime_min = excluded.runtime_min
-            """,
-            (
-                show_tmdb_id,
-                season_number,
-                episode.get('episode_number'),
-                self._clean_text(episode.get('name')),
-                episode.get('air_date'),
-                episode.get('runtime')
+                    show_pk,
+                    season.get('season_number'),
+                    self._clean_text(season.get('name')),
+                    season.get('air_date')
+                )
+                for season in seasons
+            ]
+        )
+        
+        return {
+            row['season_number']: row['season_id']
+            for row in conn.execute(
+                "SELECT season_number, season_id FROM seasons WHERE show_id = ?", (show_pk,)
             )
+        }
+    
+    def _upsert_episodes_many(self, conn: sqlite3.Connection, rows: List[tuple]):
+        """
+        Insert or update a batch of episodes
+        
+        Each row is (season_id, episode_number, title, air_date, runtime_min).
+        """
+        conn.executemany(
+            self._SQL_UPSERT_EPISODE_ROW,
+            rows
         )
     
     def _iter_popular(self, path: str, total: int):
@@ -595,70 +908,94 @@ class TMDbETLService:
                 self.logger.error(f"Error fetching page {page} from {path}: {e}")
                 break
     
+    @contextmanager
+    def _background_writer(self, write_batch, *args):
+        """
+        Run batch writes on a dedicated writer thread
+        
+        Yields a submit function that queues a batch for write_batch(*args, batch).
+        The bounded queue applies backpressure if writes fall behind fetching.
+        On exit all queued batches are written before returning.
+        """
+        batches = queue.Queue(maxsize=4)
+        
+        def run():
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                write_batch(*args, batch)
+        
+        writer = threading.Thread(target=run, name='etl-writer', daemon=True)
+        writer.start()
+        try:
+            yield batches.put
+        finally:
+            batches.put(None)
+            writer.join()
+    
     def process_movies(self, conn: sqlite3.Connection, limit: int):
         """Process movies from TMDb"""
         self.logger.info(f"Processing {limit} movies...")
         
         max_cast = self.config.get('data_limits', {}).get('max_cast', 25)
+        batch_size = self.config.get('database', {}).get('write_batch_size', 50)
+        pending = []
         
-        for summary in self._iter_popular('/movie/popular', limit):
-            movie_id = summary.get('id')
-            if not movie_id:
-                continue
-            
-            try:
-                self.stats['movies_processed'] += 1
-                
-                # Fetch detailed movie data
-                detail = self._api_get(
-                    f'/movie/{movie_id}',
-                    append_to_response='credits'
-                )
-                
-                # Validate data quality
-                if not self._validate_movie_data(detail):
-                    self.logger.debug(f"Movie {movie_id} skipped due to quality filters")
-                    self.stats['movies_skipped'] += 1
+        # Database writes run on a background thread while the next titles are fetched
+        with self._background_writer(self._write_movie_batch, conn) as submit:
+            for summary in self._iter_popular('/movie/popular', limit):
+                movie_id = summary.get('id')
+                if not movie_id:
                     continue
                 
-                # Transform data
-                movie_data = self._transform_movie_data(detail)
-                
-                # Fetch all person details BEFORE entering transaction (to avoid long-running locks)
-                credits = detail.get('credits', {}).get('cast', [])
-                person_details_map = {}
-                for cast in credits[:max_cast]:
-                    # Fetch person details OUTSIDE transaction
-                    person_details = self._fetch_person_details(cast.get('id'))
-                    # Merge cast info with person details
-                    person_details.update({
-                        'id': cast.get('id'),
-                        'name': cast.get('name'),
-                        'profile_path': cast.get('profile_path'),
-                    })
-                    person_details_map[cast.get('id')] = person_details
-                
-                # Now do all database operations in a quick transaction
-                with conn:
-                    # Upsert movie
-                    self._upsert_movie(conn, movie_data)
+                try:
+                    self._add_stat('movies_processed')
+                    
+                    # Fetch detailed movie data
+                    detail = self._api_get(
+                        f'/movie/{movie_id}',
+                        append_to_response='credits'
+                    )
                     
-                    # Link genres
-                    self._link_movie_genres(conn, movie_id, detail.get('genres', []))
+                    # Validate data quality
+                    if not self._validate_movie_data(detail):
+                        self.logger.debug(f"Movie {movie_id} skipped due to quality filters")
+                        self._add_stat('movies_skipped')
+                        continue
                     
-                    # Process cast (using pre-fetched person details)
-                    for cast in credits[:max_cast]:
-                        person_details = person_details_map.get(cast.get('id'))
-                        if person_details:
-                            self._upsert_person(conn, person_details)
-                            self._attach_movie_cast(conn, movie_id, cast)
-                
-                if self.stats['movies_processed'] % 10 == 0:
-                    self.logger.info(f"Processed {self.stats['movies_processed']} movies...")
+                    # Transform data
+                    movie_data = self._transform_movie_data(detail)
+                    
+                    # Fetch all person details BEFORE entering transaction (to avoid long-running locks)
+                    credits = detail.get('credits', {}).get('cast', [])
+                    person_details_map = self._prefetch_people(credits[:max_cast])
+                    cast_list = [
+                        cast for cast in credits[:max_cast]
+                        if person_details_map.get(cast.get('id'))
+                    ]
+                    
+                    # Queue for the next batch write
+                    pending.append((
+                        movie_data,
+                        detail.get('genres', []),
+                        cast_list,
+                        [person_details_map[cast.get('id')] for cast in cast_list],
+                    ))
+                    
+                    if self.stats['movies_processed'] % 10 == 0:
+                        self.logger.info(f"Processed {self.stats['movies_processed']} movies...")
+                    
+                except Exception as e:
+                    self.logger.error(f"Error processing movie {movie_id}: {e}")
+                    self._add_stat('errors')
                 
-            except Exception as e:
-                self.logger.error(f"Error processing movie {movie_id}: {e}")
-                self.stats['errors'] += 1
+                if len(pending) >= batch_size:
+                    submit(pending)
+                    pending = []
+            
+            if pending:
+                submit(pending)
         
         self.logger.info(
             f"Movies complete: {self.stats['movies_inserted']} inserted, "
@@ -666,101 +1003,129 @@ class TMDbETLService:
             f"{self.stats['movies_skipped']} skipped"
         )
     
+    def _write_movie_batch(self, conn: sqlite3.Connection, pending: List[tuple]):
+        """
+        Write a batch of fetched movies and their genres and cast in one transaction
+        
+        If the batch fails it is retried one movie per transaction, so a bad
+        title only rolls back its own writes and counts as a single error.
+        """
+        try:
+            with self._transaction(conn):
+                # Stage and merge all movie rows at once (last copy of a repeated id wins)
+                rows = {movie_data['tmdb_id']: self._movie_params(movie_data)
+                        for movie_data, *_ in pending}
+                inserted = self._merge_staged(conn, 'movies', list(rows.values()))
+                
+                for movie_data, genres, cast_list, people in pending:
+                    self._link_movie_genres(conn, movie_data['tmdb_id'], genres)
+                    self._upsert_people(conn, people)
+                    self._attach_movie_cast_many(conn, movie_data['tmdb_id'], cast_list)
+            
+        except Exception as e:
+            if len(pending) > 1:
+                self.logger.warning(
+                    f"Error writing batch of {len(pending)} movies, retrying one at a time: {e}"
+                )
+                for item in pending:
+                    self._write_movie_batch(conn, [item])
+                return
+            self.logger.error(f"Error writing movie {pending[0][0]['tmdb_id']}: {e}")
+            self._add_stat('errors')
+            return
+        
+        with self._stats_lock:
+            self.stats['movies_inserted'] += inserted
+            self.stats['movies_updated'] += len(rows) - inserted
+            self.stats['people_synced'] += sum(len(people) for *_, people in pending)
+    
     def process_shows(self, conn: sqlite3.Connection, limit: int, episodes_per_season: int):
         """Process TV shows from TMDb"""
         self.logger.info(f"Processing {limit} TV shows...")
         
         max_cast = self.config.get('data_limits', {}).get('max_cast', 25)
+        batch_size = self.config.get('database', {}).get('write_batch_size', 50)
+        pending = []
         
-        for summary in self._iter_popular('/tv/popular', limit):
-            show_id = summary.get('id')
-            if not show_id:
-                continue
-            
-            try:
-                self.stats['shows_processed'] += 1
-                
-                # Fetch detailed show data
-                detail = self._api_get(
-                    f'/tv/{show_id}',
-                    append_to_response='aggregate_credits,seasons'
-                )
-                
-                # Validate data quality
-                if not self._validate_show_data(detail):
-                    self.logger.debug(f"Show {show_id} skipped due to quality filters")
-                    self.stats['shows_skipped'] += 1
+        # Database writes run on a background thread while the next titles are fetched
+        with self._background_writer(
+            self._write_show_batch, conn, episodes_per_season
+        ) as submit:
+            for summary in self._iter_popular('/tv/popular', limit):
+                show_id = summary.get('id')
+                if not show_id:
                     continue
                 
-                # Transform data
-                show_data = self._transform_show_data(detail)
-                
-                # Fetch all person details BEFORE entering transaction
-                credits = detail.get('aggregate_credits', {}).get('cast', [])
-                person_details_map = {}
-                for cast in credits[:max_cast]:
-                    # Fetch person details OUTSIDE transaction
-                    person_details = self._fetch_person_details(cast.get('id'))
-                    # Merge cast info with person details
-                    person_details.update({
-                        'id': cast.get('id'),
-                        'name': cast.get('name'),
-                        'profile_path': cast.get('profile_path'),
-                    })
-                    person_details_map[cast.get('id')] = person_details
-                
-                # Fetch all season details BEFORE entering transaction
-                seasons = detail.get('seasons', [])
-                season_details_map = {}
-                for season in seasons:
-                    season_number = season.get('season_number')
-                    if season_number in (None, 0):
-                        continue  # Skip specials
-                    try:
-                        # Fetch season details OUTSIDE transaction
-                        season_detail = self._api_get(f'/tv/{show_id}/season/{season_number}')
-                        season_details_map[season_number] = season_detail
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Error fetching season {season_number} of show {show_id}: {e}"
+                try:
+                    self._add_stat('shows_processed')
+                    
+                    # Fetch detailed show data
+                    detail = self._api_get(
+                        f'/tv/{show_id}',
+                        append_to_response='aggregate_credits,seasons'
+                    )
+                    
+                    # Validate data quality
+                    if not self._validate_show_data(detail):
+                        self.logger.debug(f"Show {show_id} skipped due to quality filters")
+                        self._add_stat('shows_skipped')
+                        continue
+                    
+                    # Transform data
+                    show_data = self._transform_show_data(detail)
+                    
+                    # Fetch all person details BEFORE entering transaction
+                    credits = detail.get('aggregate_credits', {}).get('cast', [])
+                    person_details_map = self._prefetch_people(credits[:max_cast])
+                    
+                    # Fetch all season details BEFORE entering transaction, concurrently
+                    seasons = [
+                        season for season in detail.get('seasons', [])
+                        if season.get('season_number') not in (None, 0)  # Skip specials
+                    ]
+                    futures = {
+                        season['season_number']: self._executor.submit(
+                            self._api_get, f"/tv/{show_id}/season/{season['season_number']}"
                         )
-                
-                # Now do all database operations in a quick transaction
-                with conn:
-                    # Upsert show
-                    self._upsert_show(conn, show_data)
+                        for season in seasons
+                    }
+                    season_details_map = {}
+                    for season_number, future in futures.items():
+                        try:
+                            season_details_map[season_number] = future.result()
+                        except Exception as e:
+                            self.logger.warning(
+                                f"Error fetching season {season_number} of show {show_id}: {e}"
+                            )
                     
-                    # Link genres
-                    self._link_show_genres(conn, show_id, detail.get('genres', []))
+                    cast_list = [
+                        cast for cast in credits[:max_cast]
+                        if person_details_map.get(cast.get('id'))
+                    ]
                     
-                    # Process cast (using pre-fetched person details)
-                    for cast in credits[:max_cast]:
-                        person_details = person_details_map.get(cast.get('id'))
-                        if person_details:
-                            self._upsert_person(conn, person_details)
-                            self._attach_show_cast(conn, show_id, cast)
+                    # Queue for the next batch write
+                    pending.append((
+                        show_data,
+                        detail.get('genres', []),
+                        cast_list,
+                        [person_details_map[cast.get('id')] for cast in cast_list],
+                        seasons,
+                        season_details_map,
+                    ))
                     
-                    # Process seasons and episodes (using pre-fetched season details)
-                    for season in seasons:
-                        season_number = season.get('season_number')
-                        if season_number in (None, 0):
-                            continue  # Skip specials
-                        
-                        self._upsert_season(conn, show_id, season)
-                        
-                        # Use pre-fetched season details
-                        season_detail = season_details_map.get(season_number)
-                        if season_detail:
-                            episodes = season_detail.get('episodes', [])[:episodes_per_season]
-                            for episode in episodes:
-                                self._upsert_episode(conn, show_id, season_number, episode)
-                
-                if self.stats['shows_processed'] % 10 == 0:
-                    self.logger.info(f"Processed {self.stats['shows_processed']} shows...")
+                    if self.stats['shows_processed'] % 10 == 0:
+                        self.logger.info(f"Processed {self.stats['shows_processed']} shows...")
+                    
+                except Exception as e:
+                    self.logger.error(f"Error processing show {show_id}: {e}")
+                    self._add_stat('errors')
                 
-            except Exception as e:
-                self.logger.error(f"Error processing show {show_id}: {e}")
-                self.stats['errors'] += 1
+                if len(pending) >= batch_size:
+                    submit(pending)
+                    pending = []
+            
+            if pending:
+                submit(pending)
         
         self.logger.info(
             f"Shows complete: {self.stats['shows_inserted']} inserted, "
@@ -768,6 +1133,59 @@ class TMDbETLService:
             f"{self.stats['shows_skipped']} skipped"
         )
     
+    def _write_show_batch(self, conn: sqlite3.Connection, episodes_per_season: int,
+                          pending: List[tuple]):
+        """
+        Write a batch of fetched shows with their genres, cast, seasons and episodes
+        
+        If the batch fails it is retried one show per transaction, so a bad
+        title only rolls back its own writes and counts as a single error.
+        """
+        try:
+            with self._transaction(conn):
+                # Stage and merge all show rows at once (last copy of a repeated id wins)
+                rows = {show_data['tmdb_id']: self._show_params(show_data)
+                        for show_data, *_ in pending}
+                inserted = self._merge_staged(conn, 'shows', list(rows.values()))
+                
+                episode_rows = []
+                for show_data, genres, cast_list, people, seasons, season_details_map in pending:
+                    show_id = show_data['tmdb_id']
+                    self._link_show_genres(conn, show_id, genres)
+                    self._upsert_people(conn, people)
+                    self._attach_show_cast_many(conn, show_id, cast_list)
+                    
+                    season_ids = self._upsert_seasons(conn, show_id, seasons)
+                    episode_rows.extend(
+                        (
+                            season_ids[season_number],
+                            episode.get('episode_number'),
+                            self._clean_text(episode.get('name')),
+                            episode.get('air_date'),
+                            episode.get('runtime')
+                        )
+                        for season_number, season_detail in season_details_map.items()
+                        for episode in season_detail.get('episodes', [])[:episodes_per_season]
+                    )
+                self._upsert_episodes_many(conn, episode_rows)
+            
+        except Exception as e:
+            if len(pending) > 1:
+                self.logger.warning(
+                    f"Error writing batch of {len(pending)} shows, retrying one at a time: {e}"
+                )
+                for item in pending:
+                    self._write_show_batch(conn, episodes_per_season, [item])
+                return
+            self.logger.error(f"Error writing show {pending[0][0]['tmdb_id']}: {e}")
+            self._add_stat('errors')
+            return
+        
+        with self._stats_lock:
+            self.stats['shows_inserted'] += inserted
+            self.stats['shows_updated'] += len(rows) - inserted
+            self.stats['people_synced'] += sum(len(item[3]) for item in pending)
+    
     def cleanup_stale_data(self, conn: sqlite3.Connection):
         """Remove old stale data that hasn't been updated"""
         cleanup_days = self.config.get('data_quality', {}).get('cleanup_stale_days', 0)
@@ -779,38 +1197,103 @@ class TMDbETLService:
         
         cutoff_date = (datetime.now() - timedelta(days=cleanup_days)).isoformat()
         
-        with conn:
-            # Note: This assumes your schema has created_at columns
-            # Modify if your schema is different
-            cursor = conn.execute(
-                "DELETE FROM movies WHERE created_at < ?",
-                (cutoff_date,)
-            )
-            movies_deleted = cursor.rowcount
-            
-            cursor = conn.execute(
-                "DELETE FROM shows WHERE created_at < ?",
-                (cutoff_date,)
-            )
-            shows_deleted = cursor.rowcount
+        # Note: This assumes your schema has created_at columns
+        # Modify if your schema is different
+        movies_deleted = self._delete_stale_rows(conn, 'movies', cutoff_date)
+        shows_deleted = self._delete_stale_rows(conn, 'shows', cutoff_date)
         
         self.logger.info(
             f"Cleanup complete: {movies_deleted} movies, {shows_deleted} shows removed"
         )
     
-    def vacuum_database(self):
-        """Optimize database with VACUUM"""
-        self.logger.info("Running VACUUM to optimize database...")
+    def _delete_stale_rows(self, conn: sqlite3.Connection, table: str, cutoff_date: str,
+                           batch_size: int = 5000) -> int:
+        """Delete rows created before cutoff_date in batches; returns rows deleted"""
+        deleted = 0
+        while True:
+            # Each batch is its own short transaction so writers aren't blocked
+            # for the length of a large purge
+            with self._transaction(conn):
+                cursor = conn.execute(
+                    f"""
+                    DELETE FROM {table} WHERE rowid IN (
+                        SELECT rowid FROM {table} WHERE created_at < ? LIMIT ?
+                    )
+                    """,
+                    (cutoff_date, batch_size)
+                )
+            deleted += cursor.rowcount
+            
+            # Cascaded deletes make each batch WAL-heavy; checkpoint between
+            # batches (without waiting on readers) so the WAL stays small
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            
+            if cursor.rowcount < batch_size:
+                return deleted
+    
+    def vacuum_database(self, max_pages: int = 1000):
+        """Reclaim free pages with an incremental vacuum"""
+        self.logger.info("Running incremental vacuum to optimize database...")
         
         try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
-            conn.execute("PRAGMA busy_timeout = 30000")
-            conn.execute("VACUUM")
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            self._configure_connection(conn)
+            
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                # One-time migration: auto_vacuum only changes on a full VACUUM
+                self.logger.info("Switching database to auto_vacuum=INCREMENTAL (one-time full VACUUM)")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                # Only touches the freed pages instead of rewriting the whole file.
+                # executescript steps the pragma to completion (execute frees one page)
+                conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)})")
+            
             conn.close()
             self.logger.info("Database optimization complete")
         except Exception as e:
             self.logger.error(f"VACUUM failed: {e}")
     
+    # Tables written by the ETL whose secondary indexes can be deferred
+    _ETL_TABLES = (
+        'movies', 'shows', 'people', 'movie_genres', 'show_genres',
+        'movie_cast', 'show_cast', 'seasons', 'episodes',
+    )
+    
+    def _defer_indexes(self, conn: sqlite3.Connection) -> List[str]:
+        """
+        Drop non-unique secondary indexes on the ETL tables before a bulk load
+        
+        Returns the CREATE INDEX statements needed to rebuild them.
+        UNIQUE and automatic indexes back ON CONFLICT upserts and are kept.
+        """
+        placeholders = ', '.join('?' for _ in self._ETL_TABLES)
+        rows = conn.execute(
+            f"""
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+            """,
+            self._ETL_TABLES
+        ).fetchall()
+        deferred = [row for row in rows if not row['sql'].upper().startswith('CREATE UNIQUE')]
+        
+        with self._transaction(conn):
+            for row in deferred:
+                conn.execute(f'DROP INDEX IF EXISTS "{row["name"]}"')
+        
+        if deferred:
+            self.logger.info(f"Deferred {len(deferred)} indexes for bulk load")
+        return [row['sql'] for row in deferred]
+    
+    def _restore_indexes(self, conn: sqlite3.Connection, index_ddl: List[str]):
+        """Recreate indexes dropped by _defer_indexes"""
+        if not index_ddl:
+            return
+        with self._transaction(conn):
+            for ddl in index_ddl:
+                conn.execute(ddl)
+        self.logger.info(f"Rebuilt {len(index_ddl)} deferred indexes")
+    
     def run_full_etl(self) -> dict:
         """Run the complete ETL pipeline"""
         start_time = time.time()
@@ -836,11 +1319,20 @@ class TMDbETLService:
             show_limit = limits.get('shows', 50)
             episodes_per_season = limits.get('episodes_per_season', 10)
             
-            # Process movies
-            self.process_movies(conn, movie_limit)
+            # A full refresh loads faster without secondary indexes; incremental
+            # runs keep them since they touch few rows and serve app reads
+            deferred_indexes = []
+            if not self.config.get('database', {}).get('incremental_mode', True):
+                deferred_indexes = self._defer_indexes(conn)
             
-            # Process TV shows
-            self.process_shows(conn, show_limit, episodes_per_season)
+            try:
+                # Process movies
+                self.process_movies(conn, movie_limit)
+                
+                # Process TV shows
+                self.process_shows(conn, show_limit, episodes_per_season)
+            finally:
+                self._restore_indexes(conn, deferred_indexes)
             
             # Optional: Clean up stale data
             self.cleanup_stale_data(conn)
@@ -856,6 +1348,6 @@ class TMDbETLService:
             
         except Exception as e:
             self.logger.error(f"ETL pipeline failed: {e}", exc_info=True)
-            self.stats['errors'] += 1
+            self._add_stat('errors')
             raise
 
@@ -9,6 +9,7 @@ import argparse
 import os
 import signal
 import sys
+import threading
 from pathlib import Path
 
 # Add project root to path
@@ -16,11 +17,14 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from etl.scheduler import ETLScheduler
 
+# Set by signal_handler to wake the main thread for shutdown
+stop_event = threading.Event()
+
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
     print("\n\nReceived shutdown signal. Stopping scheduler...")
-    sys.exit(0)
+    stop_event.set()
 
 
 def main():
@@ -102,10 +106,6 @@ Examples:
         print("Please set it in your .env file or environment variables")
         return 1
     
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     try:
         # Create scheduler instance
         scheduler = ETLScheduler(config_path=args.config)
@@ -128,6 +128,10 @@ Examples:
             print("\nETL job complete. Exiting.")
             return 0
         
+        # Register signal handlers
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+        
         # Start continuous scheduler
         scheduler.start()
         
@@ -143,10 +147,13 @@ Examples:
         print("\nPress Ctrl+C to stop the scheduler")
         print("=" * 80 + "\n")
         
-        # Keep running
-        import time
-        while True:
-            time.sleep(60)
+        # Block until a shutdown signal arrives. The bounded wait returns to the
+        # interpreter every second so signal handlers still run on Windows,
+        # where an untimed lock wait cannot be interrupted by Ctrl+C
+        while not stop_event.wait(1.0):
+            pass
+        scheduler.stop()
+        return 0
     
     except KeyboardInterrupt:
         print("\n\nShutdown requested by user")
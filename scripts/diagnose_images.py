@@ -15,15 +15,26 @@ resolved or returned a non-200 status code.
 from __future__ import annotations
 
 import argparse
+import itertools
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 IMAGE_BASE = "https://image.tmdb.org/t/p"
+MAX_WORKERS = 32
+FETCH_BATCH_SIZE = 1000
+PROBE_CHUNK_SIZE = 100
+
+# Shared keep-alive session for the concurrent probes
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=64, pool_maxsize=64))
+SESSION.mount("http://", HTTPAdapter(pool_connections=64, pool_maxsize=64))
 
 
 @dataclass
@@ -46,6 +57,8 @@ def resolve_path(path: Optional[str], size: str) -> Optional[str]:
 
 
 def fetch_records(conn: sqlite3.Connection, limit: Optional[int]) -> Iterable[Record]:
+    # idx_movies_title_nocase / idx_shows_title_nocase cover both legs in title
+    # order, so SQLite merges two index scans instead of sorting the catalog
     sql = """
         SELECT 'movie' AS media_type,
                movie_id AS db_id,
@@ -66,32 +79,57 @@ def fetch_records(conn: sqlite3.Connection, limit: Optional[int]) -> Iterable[Re
     """
     if limit is not None:
         sql += " LIMIT ?"
-        rows = conn.execute(sql, (limit,))
+        cursor = conn.execute(sql, (limit,))
     else:
-        rows = conn.execute(sql)
-    for row in rows:
-        yield Record(
-            media_type=row[0],
-            db_id=row[1],
-            tmdb_id=row[2],
-            title=row[3],
-            poster_path=row[4],
-            backdrop_path=row[5],
-        )
+        cursor = conn.execute(sql)
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            yield Record(
+                media_type=row[0],
+                db_id=row[1],
+                tmdb_id=row[2],
+                title=row[3],
+                poster_path=row[4],
+                backdrop_path=row[5],
+            )
 
 
 def check_url(url: str) -> tuple[bool, int]:
     try:
-        resp = requests.head(url, allow_redirects=True, timeout=8)
+        resp = SESSION.head(url, allow_redirects=True, timeout=8)
         status = resp.status_code
         if status == 405:  # some CDN endpoints disallow HEAD; fall back to GET
-            resp = requests.get(url, stream=True, timeout=8)
-            status = resp.status_code
+            with SESSION.get(url, stream=True, timeout=8) as resp:
+                status = resp.status_code
         return 200 <= status < 400, status
     except requests.RequestException:
         return False, 0
 
 
+def probe_record(record: Record) -> tuple[Record, Optional[str], bool, int]:
+    """Resolve and probe a record's poster URL; url is None when no path is stored."""
+    poster_url = resolve_path(record.poster_path, "w342")
+    if not poster_url:
+        return record, None, False, 0
+    ok, status = check_url(poster_url)
+    return record, poster_url, ok, status
+
+
+def probe_records(records: Iterable[Record]) -> Iterable[tuple[Record, Optional[str], bool, int]]:
+    """Probe records on a thread pool, keeping at most PROBE_CHUNK_SIZE in flight."""
+    records = iter(records)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # executor.map submits everything up front, so feed it one chunk at a time
+        while True:
+            chunk = list(itertools.islice(records, PROBE_CHUNK_SIZE))
+            if not chunk:
+                break
+            yield from executor.map(probe_record, chunk)
+
+
 def main() -> None:
     load_dotenv()
     parser = argparse.ArgumentParser(description="Diagnose missing artwork for movies/shows.")
@@ -114,14 +152,13 @@ def main() -> None:
     unreachable: list[str] = []
     checked = 0
 
-    for record in fetch_records(conn, args.limit):
+    # Probes are network-bound, so overlap them across a thread pool
+    for record, poster_url, ok, status in probe_records(fetch_records(conn, args.limit)):
         checked += 1
-        poster_url = resolve_path(record.poster_path, "w342")
         if not poster_url:
             missing_path.append(f"{record.media_type}:{record.db_id} ({record.title}) → poster_path missing")
             continue
 
-        ok, status = check_url(poster_url)
         if not ok:
             unreachable.append(
                 f"{record.media_type}:{record.db_id} ({record.title}) → {poster_url} [status={status}]"
@@ -8,6 +8,7 @@ from __future__ import annotations
 import os
 import sqlite3
 import sys
+from contextlib import closing
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,13 +17,37 @@ load_dotenv()
 DB_PATH = os.getenv("DATABASE_PATH", os.path.join(os.path.dirname(__file__), "..", "movie_tracker.db"))
 
 
-def fix_stranger_things_cast():
-    """Fix the incorrect cast association for Stranger Things."""
+def ensure_indexes(conn: sqlite3.Connection):
+    """Create the indexes backing the character and name lookups below."""
+    # people.tmdb_person_id is UNIQUE and shows.title has idx_shows_title in
+    # db/schema.sql, so only the show_cast character lookup and the duplicate
+    # search on people.name need indexes
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_show_cast_show_character ON show_cast(show_id, character)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_people_name ON people(name)")
+
+
+def connect() -> sqlite3.Connection:
+    """Open the database connection shared by the verify and fix steps."""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    
+    # WAL + NORMAL sync: one fsync per checkpoint instead of per commit
+    conn.executescript(
+        "PRAGMA journal_mode = WAL;"
+        "PRAGMA synchronous = NORMAL;"
+        "PRAGMA temp_store = MEMORY;"
+        "PRAGMA cache_size = -65536;"
+        "PRAGMA foreign_keys = ON;"
+    )
+    return conn
+
+
+def fix_stranger_things_cast(conn: sqlite3.Connection):
+    """Fix the incorrect cast association for Stranger Things."""
     try:
+        ensure_indexes(conn)
+        
         # Find Stranger Things show_id
         show_row = conn.execute(
             "SELECT show_id, tmdb_id FROM shows WHERE title = 'Stranger Things' LIMIT 1"
@@ -63,10 +88,12 @@ def fix_stranger_things_cast():
                 print("You may need to run the ETL script to populate cast data.")
                 return False
             
-            # Check if there's a separate Millie Bobby Brown record
-            millie_record = conn.execute(
-                "SELECT person_id, name, tmdb_person_id FROM people WHERE name LIKE '%Millie Bobby Brown%' LIMIT 1"
-            ).fetchone()
+            # Any other person row named Millie Bobby Brown is a duplicate;
+            # exact name match instead of LIKE '%...%' so it can seek an index
+            duplicate_records = conn.execute(
+                "SELECT person_id FROM people WHERE name = ? AND tmdb_person_id IS NOT ?",
+                ('Millie Bobby Brown', 87545)
+            ).fetchall()
             
             with conn:
                 # If the person record with tmdb_id 87545 has wrong name, fix it
@@ -86,36 +113,31 @@ def fix_stranger_things_cast():
                 )
                 print(f"\nDeleted all Eleven cast entries (including duplicates)")
                 
-                # If there's a duplicate Millie record, delete it after moving any other cast entries
-                if millie_record and millie_record['person_id'] != millie_person_id:
-                    print(f"\nFound duplicate Millie Bobby Brown record (person_id: {millie_record['person_id']})")
-                    # Check if duplicate has any other cast entries besides Eleven (which we just deleted)
-                    other_cast = conn.execute(
-                        "SELECT COUNT(*) as cnt FROM show_cast WHERE person_id = ?",
-                        (millie_record['person_id'],)
+                # If there are duplicate Millie records, delete them after moving any other cast entries
+                for duplicate in duplicate_records:
+                    print(f"\nFound duplicate Millie Bobby Brown record (person_id: {duplicate['person_id']})")
+                    # Only delete if it has no cast entries left besides Eleven (which we just deleted)
+                    deleted = conn.execute(
+                        """
+                        DELETE FROM people
+                        WHERE person_id = ?
+                          AND NOT EXISTS (SELECT 1 FROM show_cast WHERE person_id = people.person_id)
+                        RETURNING person_id
+                        """,
+                        (duplicate['person_id'],)
                     ).fetchone()
-                    if other_cast['cnt'] == 0:
-                        conn.execute(
-                            "DELETE FROM people WHERE person_id = ?",
-                            (millie_record['person_id'],)
-                        )
+                    if deleted:
                         print(f"Deleted duplicate person record (no other cast entries)")
                 
-                # Insert the correct cast entry for Millie Bobby Brown as Eleven
-                # Use INSERT OR IGNORE in case there's still a conflict
+                # Insert the correct cast entry for Millie Bobby Brown as Eleven,
+                # or update her existing row for this show
                 conn.execute(
                     """
-                    INSERT OR IGNORE INTO show_cast (show_id, person_id, character, cast_order) 
+                    INSERT INTO show_cast (show_id, person_id, character, cast_order)
                     VALUES (?, ?, 'Eleven', 1)
-                    """,
-                    (show_id, millie_person_id)
-                )
-                # Update if it already exists
-                conn.execute(
-                    """
-                    UPDATE show_cast 
-                    SET character = 'Eleven', cast_order = 1 
-                    WHERE show_id = ? AND person_id = ?
+                    ON CONFLICT(show_id, person_id) DO UPDATE SET
+                        character = excluded.character,
+                        cast_order = excluded.cast_order
                     """,
                     (show_id, millie_person_id)
                 )
@@ -155,15 +177,10 @@ def fix_stranger_things_cast():
         print(f"\nERROR: {e}")
         conn.rollback()
         return False
-    finally:
-        conn.close()
 
 
-def verify_cast():
+def verify_cast(conn: sqlite3.Connection):
     """Verify the cast for Stranger Things."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    
     try:
         show_row = conn.execute(
             "SELECT show_id FROM shows WHERE title = 'Stranger Things' LIMIT 1"
@@ -193,8 +210,6 @@ def verify_cast():
             
     except Exception as e:
         print(f"ERROR: {e}")
-    finally:
-        conn.close()
 
 
 if __name__ == "__main__":
@@ -203,20 +218,22 @@ if __name__ == "__main__":
     print("=" * 60)
     print(f"\nDatabase: {DB_PATH}\n")
     
-    print("Current cast:")
-    verify_cast()
-    
-    print("\n" + "=" * 60)
-    print("FIXING CAST DATA")
-    print("=" * 60)
-    
-    success = fix_stranger_things_cast()
-    
-    if success:
+    # One connection serves the before/after verification and the fix
+    with closing(connect()) as conn:
+        print("Current cast:")
+        verify_cast(conn)
+        
         print("\n" + "=" * 60)
-        print("VERIFICATION")
+        print("FIXING CAST DATA")
         print("=" * 60)
-        verify_cast()
+        
+        success = fix_stranger_things_cast(conn)
+        
+        if success:
+            print("\n" + "=" * 60)
+            print("VERIFICATION")
+            print("=" * 60)
+            verify_cast(conn)
     
     sys.exit(0 if success else 1)
 
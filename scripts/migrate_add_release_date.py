@@ -6,6 +6,7 @@ This allows proper chronological sorting by full date instead of just year
 import os
 import sqlite3
 import sys
+from contextlib import closing
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -13,10 +14,41 @@ load_dotenv()
 
 DB_PATH = os.getenv("DATABASE_PATH", os.path.join(os.path.dirname(__file__), "..", "movie_tracker.db"))
 
+def tune(conn: sqlite3.Connection) -> None:
+    """
+    Apply the connection settings shared by the migration scripts.
+    journal_mode = WAL is persistent, so a migrated database is left in the
+    journal mode the ETL and API connections expect; foreign_keys enforces
+    references while migrations run; the in-memory temp store and larger
+    cache keep CREATE INDEX sorts and table copies off disk.
+    """
+    conn.executescript(
+        "PRAGMA journal_mode = WAL;"
+        "PRAGMA synchronous = NORMAL;"
+        "PRAGMA temp_store = MEMORY;"
+        "PRAGMA cache_size = -65536;"
+        "PRAGMA foreign_keys = ON;"
+    )
+
 def has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
     """Check if a column exists in a table"""
-    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-    return any(row[1] == column for row in rows)
+    return conn.execute(
+        "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1", (table, column)
+    ).fetchone() is not None
+
+def add_release_date(conn: sqlite3.Connection) -> bool:
+    """
+    Add the release_date column if it doesn't exist; returns True if added.
+    The caller owns the transaction (see migrate() and migrate_all.py).
+    """
+    if has_column(conn, "movies", "release_date"):
+        print("[OK] Column 'release_date' already exists in movies table")
+        return False
+    
+    print("Adding 'release_date' column to movies table...")
+    conn.execute("ALTER TABLE movies ADD COLUMN release_date TEXT")
+    print("[OK] Successfully added 'release_date' column")
+    return True
 
 def migrate():
     """Add release_date column if it doesn't exist"""
@@ -24,33 +56,28 @@ def migrate():
         print(f"Error: Database file not found at {DB_PATH}")
         return False
     
-    conn = sqlite3.connect(DB_PATH)
-    
-    try:
-        # Check if column already exists
-        if has_column(conn, "movies", "release_date"):
-            print("[OK] Column 'release_date' already exists in movies table")
-            return True
+    # closing() releases the connection; the inner "with conn" commits or
+    # rolls back the explicit BEGIN IMMEDIATE
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        tune(conn)
         
-        print("Adding 'release_date' column to movies table...")
-        conn.execute("ALTER TABLE movies ADD COLUMN release_date TEXT")
-        conn.commit()
-        
-        print("[OK] Successfully added 'release_date' column")
-        
-        # Count movies
-        count = conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
-        print(f"  Database has {count} movies")
-        print("  Note: Existing movies will get release_date populated on next ETL run")
-        
-        return True
-        
-    except sqlite3.Error as e:
-        print(f"✗ Error during migration: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                added = add_release_date(conn)
+            if not added:
+                return True
+            
+            # Count movies
+            count = conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+            print(f"  Database has {count} movies")
+            print("  Note: Existing movies will get release_date populated on next ETL run")
+            
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"✗ Error during migration: {e}")
+            return False
 
 if __name__ == "__main__":
     print("=" * 80)
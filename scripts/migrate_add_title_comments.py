@@ -6,9 +6,12 @@ This table supports per-title comments with nested replies
 import os
 import sqlite3
 import sys
+from contextlib import closing
 from pathlib import Path
 from dotenv import load_dotenv
 
+from migrate_add_release_date import tune
+
 load_dotenv()
 
 DB_PATH = os.getenv("DATABASE_PATH", os.path.join(os.path.dirname(__file__), "..", "movie_tracker.db"))
@@ -21,48 +24,55 @@ def table_exists(conn: sqlite3.Connection, table: str) -> bool:
     )
     return cursor.fetchone() is not None
 
+def add_title_comments(conn: sqlite3.Connection) -> bool:
+    """
+    Create the title_comments table and its indexes if the table doesn't
+    exist; returns True if created. The caller owns the transaction (see
+    migrate() and migrate_all.py).
+    """
+    if table_exists(conn, "title_comments"):
+        print("[OK] Table 'title_comments' already exists")
+        return False
+    
+    print("Creating 'title_comments' table...")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS title_comments (
+            comment_id      INTEGER PRIMARY KEY,
+            title_type      TEXT NOT NULL CHECK (title_type IN ('movie', 'show')),
+            title_id        INTEGER NOT NULL,
+            user_id         INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            parent_comment_id INTEGER REFERENCES title_comments(comment_id) ON DELETE CASCADE,
+            body            TEXT NOT NULL,
+            created_at      TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at      TEXT DEFAULT CURRENT_TIMESTAMP,
+            is_deleted      INTEGER DEFAULT 0 CHECK (is_deleted IN (0, 1))
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_title_comments_title ON title_comments(title_type, title_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_title_comments_user ON title_comments(user_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_title_comments_parent ON title_comments(parent_comment_id)")
+    print("[OK] Successfully created 'title_comments' table with indexes")
+    return True
+
 def migrate():
     """Add title_comments table if it doesn't exist"""
     if not os.path.exists(DB_PATH):
         print(f"Error: Database file not found at {DB_PATH}")
         return False
     
-    conn = sqlite3.connect(DB_PATH)
-    
-    try:
-        # Check if table already exists
-        if table_exists(conn, "title_comments"):
-            print("[OK] Table 'title_comments' already exists")
-            return True
-        
-        print("Creating 'title_comments' table...")
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS title_comments (
-                comment_id      INTEGER PRIMARY KEY,
-                title_type      TEXT NOT NULL CHECK (title_type IN ('movie', 'show')),
-                title_id        INTEGER NOT NULL,
-                user_id         INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
-                parent_comment_id INTEGER REFERENCES title_comments(comment_id) ON DELETE CASCADE,
-                body            TEXT NOT NULL,
-                created_at      TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at      TEXT DEFAULT CURRENT_TIMESTAMP,
-                is_deleted      INTEGER DEFAULT 0 CHECK (is_deleted IN (0, 1))
-            )
-        """)
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_title_comments_title ON title_comments(title_type, title_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_title_comments_user ON title_comments(user_id)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_title_comments_parent ON title_comments(parent_comment_id)")
-        conn.commit()
-        
-        print("[OK] Successfully created 'title_comments' table with indexes")
-        return True
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        tune(conn)
         
-    except sqlite3.Error as e:
-        print(f"✗ Error during migration: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+        try:
+            # The table and its indexes are created atomically
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                add_title_comments(conn)
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"✗ Error during migration: {e}")
+            return False
 
 if __name__ == "__main__":
     print("=" * 80)
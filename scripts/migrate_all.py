@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Run all schema migrations in one pass
+Uses a single connection and applies every migration inside one transaction,
+so either all of them take effect or none do
+"""
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from dotenv import load_dotenv
+
+from migrate_add_release_date import add_release_date, tune
+from migrate_add_title_comments import add_title_comments
+
+load_dotenv()
+
+DB_PATH = os.getenv("DATABASE_PATH", os.path.join(os.path.dirname(__file__), "..", "movie_tracker.db"))
+
+# Applied in order; each takes the shared connection and skips itself if
+# its change is already present
+MIGRATIONS = [
+    add_release_date,
+    add_title_comments,
+]
+
+def migrate_all():
+    """Apply all pending migrations in a single transaction"""
+    if not os.path.exists(DB_PATH):
+        print(f"Error: Database file not found at {DB_PATH}")
+        return False
+    
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        tune(conn)
+        
+        try:
+            # sqlite3 doesn't open a transaction for DDL on its own
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for migration in MIGRATIONS:
+                    migration(conn)
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"✗ Error during migration: {e}")
+            return False
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("Running all migrations")
+    print("=" * 80)
+    print(f"\nDatabase: {DB_PATH}")
+    print()
+    
+    success = migrate_all()
+    
+    print()
+    print("=" * 80)
+    if success:
+        print("All migrations completed successfully!")
+    else:
+        print("Migration failed!")
+        sys.exit(1)
@@ -5,6 +5,7 @@ Populate Bob's profile with favorites (reviews), comments, and watchlist items.
 import sqlite3
 import random
 import os
+from contextlib import closing
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -28,196 +29,232 @@ def get_bob_user_id(conn):
 
 def populate_bob_data():
     """Populate Bob's favorites, comments, and watchlist."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    
-    bob_id = get_bob_user_id(conn)
-    print(f"Bob's user_id: {bob_id}")
-    
-    # Get available movies and shows
-    movies = conn.execute(
-        "SELECT movie_id, title FROM movies WHERE overview IS NOT NULL AND overview != '' ORDER BY popularity DESC LIMIT 50"
-    ).fetchall()
-    
-    shows = conn.execute(
-        "SELECT show_id, title FROM shows WHERE overview IS NOT NULL AND overview != '' ORDER BY popularity DESC LIMIT 50"
-    ).fetchall()
-    
-    print(f"Found {len(movies)} movies and {len(shows)} shows")
-    
-    # Clear Bob's existing data (optional - comment out if you want to keep existing)
-    conn.execute("DELETE FROM reviews WHERE user_id = ?", (bob_id,))
-    conn.execute("DELETE FROM watchlists WHERE user_id = ?", (bob_id,))
-    conn.execute("DELETE FROM comments WHERE user_id = ?", (bob_id,))
-    # Delete discussions created by Bob
-    discussion_ids = [r[0] for r in conn.execute("SELECT discussion_id FROM discussions WHERE user_id = ?", (bob_id,)).fetchall()]
-    if discussion_ids:
-        conn.execute("DELETE FROM comments WHERE discussion_id IN ({})".format(','.join('?'*len(discussion_ids))), discussion_ids)
-        conn.execute("DELETE FROM discussions WHERE user_id = ?", (bob_id,))
-    
-    # 1. Add FAVORITES (reviews with ratings) - 20 movies, 15 shows
-    print("\n=== Adding Favorites (Reviews) ===")
-    favorite_movies = random.sample([m['movie_id'] for m in movies], min(20, len(movies)))
-    favorite_shows = random.sample([s['show_id'] for s in shows], min(15, len(shows)))
-    
-    review_contents = [
-        "Absolutely amazing! One of my all-time favorites.",
-        "Incredible storytelling and cinematography. Highly recommend!",
-        "This blew my mind. The acting was phenomenal.",
-        "A masterpiece. Every scene was perfectly crafted.",
-        "Loved every minute of it. Can't wait to watch again!",
-        "Brilliant direction and writing. Top tier entertainment.",
-        "One of the best I've seen this year. Stunning visuals.",
-        "Exceptional quality. The plot twists were incredible.",
-        "A true gem. The character development was outstanding.",
-        "Perfect blend of action and emotion. Absolutely loved it!",
-        "This is why I love cinema. Pure excellence.",
-        "Outstanding performances all around. A must-watch!",
-        "The soundtrack alone is worth watching for.",
-        "Incredible attention to detail. A work of art.",
-        "This will stay with me for a long time. Beautiful.",
-    ]
-    
-    # Add movie reviews
-    for movie_id in favorite_movies:
-        rating = round(random.uniform(7.5, 10.0), 1)
-        content = random.choice(review_contents)
-        # Random date within last 6 months
-        days_ago = random.randint(0, 180)
-        created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
-        
-        conn.execute(
-            "INSERT INTO reviews (user_id, movie_id, rating, content, created_at) VALUES (?, ?, ?, ?, ?)",
-            (bob_id, movie_id, rating, content, created_at)
+    with closing(sqlite3.connect(DB_PATH)) as conn:
+        conn.row_factory = sqlite3.Row
+        # WAL + NORMAL sync: one fsync per checkpoint instead of per commit
+        conn.executescript(
+            "PRAGMA journal_mode = WAL;"
+            "PRAGMA synchronous = NORMAL;"
+            "PRAGMA temp_store = MEMORY;"
+            "PRAGMA cache_size = -65536;"
+            "PRAGMA foreign_keys = ON;"
         )
-        movie_title = next((m['title'] for m in movies if m['movie_id'] == movie_id), 'Unknown')
-        print(f"  [+] Movie review: {movie_title[:50]} - Rating: {rating}/10")
-    
-    # Add show reviews
-    for show_id in favorite_shows:
-        rating = round(random.uniform(7.5, 10.0), 1)
-        content = random.choice(review_contents)
-        days_ago = random.randint(0, 180)
-        created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
         
-        conn.execute(
-            "INSERT INTO reviews (user_id, show_id, rating, content, created_at) VALUES (?, ?, ?, ?, ?)",
-            (bob_id, show_id, rating, content, created_at)
-        )
-        show_title = next((s['title'] for s in shows if s['show_id'] == show_id), 'Unknown')
-        print(f"  [+] Show review: {show_title[:50]} - Rating: {rating}/10")
-    
-    # 2. Add WATCHLIST items - 15 movies, 12 shows
-    print("\n=== Adding Watchlist Items ===")
-    watchlist_movies = random.sample([m['movie_id'] for m in movies if m['movie_id'] not in favorite_movies], min(15, len(movies) - len(favorite_movies)))
-    watchlist_shows = random.sample([s['show_id'] for s in shows if s['show_id'] not in favorite_shows], min(12, len(shows) - len(favorite_shows)))
-    
-    # Add movie watchlist items
-    for movie_id in watchlist_movies:
-        days_ago = random.randint(0, 90)
-        added_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
-        conn.execute(
-            "INSERT OR IGNORE INTO watchlists (user_id, movie_id, show_id, added_at) VALUES (?, ?, NULL, ?)",
-            (bob_id, movie_id, added_at)
-        )
-        movie_title = next((m['title'] for m in movies if m['movie_id'] == movie_id), 'Unknown')
-        print(f"  [+] Watchlist movie: {movie_title[:50]}")
-    
-    # Add show watchlist items
-    for show_id in watchlist_shows:
-        days_ago = random.randint(0, 90)
-        added_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
-        conn.execute(
-            "INSERT OR IGNORE INTO watchlists (user_id, movie_id, show_id, added_at) VALUES (?, NULL, ?, ?)",
-            (bob_id, show_id, added_at)
-        )
-        show_title = next((s['title'] for s in shows if s['show_id'] == show_id), 'Unknown')
-        print(f"  [+] Watchlist show: {show_title[:50]}")
-    
-    # 3. Add DISCUSSIONS and COMMENTS
-    print("\n=== Adding Discussions and Comments ===")
-    
-    # Create discussions for some of Bob's favorite movies/shows
-    discussion_titles = [
-        "What did you think of the ending?",
-        "Best scene in the entire series/movie?",
-        "Who was your favorite character?",
-        "The cinematography was incredible!",
-        "Anyone else catch that easter egg?",
-        "The soundtrack is amazing!",
-        "What's your theory about...?",
-        "This deserves more recognition!",
-    ]
-    
-    discussion_contents = [
-        "I've been thinking about this for days. What are your thoughts?",
-        "This really stood out to me. Anyone else feel the same?",
-        "I noticed something interesting on my rewatch. Did you catch it?",
-        "The attention to detail here is incredible!",
-        "This is one of those moments that makes the whole thing worth it.",
-        "I can't stop thinking about this scene. So powerful!",
-        "What did everyone think about this part?",
-        "This is why I love this show/movie so much!",
-    ]
-    
-    # Create discussions for 8 movies
-    discussion_movies = random.sample(favorite_movies, min(8, len(favorite_movies)))
-    for movie_id in discussion_movies:
-        title = random.choice(discussion_titles)
-        days_ago = random.randint(0, 60)
-        created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
+        bob_id = get_bob_user_id(conn)
+        print(f"Bob's user_id: {bob_id}")
         
-        cursor = conn.execute(
-            "INSERT INTO discussions (user_id, movie_id, show_id, title, created_at) VALUES (?, ?, NULL, ?, ?)",
-            (bob_id, movie_id, title, created_at)
-        )
-        discussion_id = cursor.lastrowid
-        movie_title = next((m['title'] for m in movies if m['movie_id'] == movie_id), 'Unknown')
-        print(f"  [+] Discussion: {title} (Movie: {movie_title[:40]})")
+        # Reference time for all generated timestamps
+        now = datetime.now()
         
-        # Add 2-4 comments to each discussion
-        num_comments = random.randint(2, 4)
-        for i in range(num_comments):
-            comment_days_ago = random.randint(0, days_ago)
-            comment_created_at = (datetime.now() - timedelta(days=comment_days_ago)).isoformat()
-            content = random.choice(discussion_contents)
-            conn.execute(
-                "INSERT INTO comments (discussion_id, user_id, content, created_at) VALUES (?, ?, ?, ?)",
-                (discussion_id, bob_id, content, comment_created_at)
-            )
-        print(f"    -> Added {num_comments} comments")
-    
-    # Create discussions for 6 shows
-    discussion_shows = random.sample(favorite_shows, min(6, len(favorite_shows)))
-    for show_id in discussion_shows:
-        title = random.choice(discussion_titles)
-        days_ago = random.randint(0, 60)
-        created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
+        # Get available movies and shows
+        movies = conn.execute(
+            "SELECT movie_id, title FROM movies WHERE overview IS NOT NULL AND overview != '' ORDER BY popularity DESC LIMIT 50"
+        ).fetchall()
         
-        cursor = conn.execute(
-            "INSERT INTO discussions (user_id, movie_id, show_id, title, created_at) VALUES (?, NULL, ?, ?, ?)",
-            (bob_id, show_id, title, created_at)
-        )
-        discussion_id = cursor.lastrowid
-        show_title = next((s['title'] for s in shows if s['show_id'] == show_id), 'Unknown')
-        print(f"  [+] Discussion: {title} (Show: {show_title[:40]})")
+        shows = conn.execute(
+            "SELECT show_id, title FROM shows WHERE overview IS NOT NULL AND overview != '' ORDER BY popularity DESC LIMIT 50"
+        ).fetchall()
+        
+        print(f"Found {len(movies)} movies and {len(shows)} shows")
         
-        # Add 2-4 comments to each discussion
-        num_comments = random.randint(2, 4)
-        for i in range(num_comments):
-            comment_days_ago = random.randint(0, days_ago)
-            comment_created_at = (datetime.now() - timedelta(days=comment_days_ago)).isoformat()
-            content = random.choice(discussion_contents)
+        movie_title_by_id = {m['movie_id']: m['title'] for m in movies}
+        show_title_by_id = {s['show_id']: s['title'] for s in shows}
+        
+        # All deletes and inserts below commit (or roll back) as one transaction
+        with conn:
+            # Clear Bob's existing data (optional - comment out if you want to keep existing)
+            conn.execute("DELETE FROM comments WHERE user_id = ?", (bob_id,))
+            # Delete discussions created by Bob, along with their comments
             conn.execute(
+                "DELETE FROM comments WHERE discussion_id IN (SELECT discussion_id FROM discussions WHERE user_id = ?)",
+                (bob_id,)
+            )
+            conn.execute("DELETE FROM reviews WHERE user_id = ?", (bob_id,))
+            conn.execute("DELETE FROM watchlists WHERE user_id = ?", (bob_id,))
+            conn.execute("DELETE FROM discussions WHERE user_id = ?", (bob_id,))
+            
+            # 1. Add FAVORITES (reviews with ratings) - 20 movies, 15 shows
+            print("\n=== Adding Favorites (Reviews) ===")
+            favorite_movies = random.sample([m['movie_id'] for m in movies], min(20, len(movies)))
+            favorite_shows = random.sample([s['show_id'] for s in shows], min(15, len(shows)))
+            
+            review_contents = [
+                "Absolutely amazing! One of my all-time favorites.",
+                "Incredible storytelling and cinematography. Highly recommend!",
+                "This blew my mind. The acting was phenomenal.",
+                "A masterpiece. Every scene was perfectly crafted.",
+                "Loved every minute of it. Can't wait to watch again!",
+                "Brilliant direction and writing. Top tier entertainment.",
+                "One of the best I've seen this year. Stunning visuals.",
+                "Exceptional quality. The plot twists were incredible.",
+                "A true gem. The character development was outstanding.",
+                "Perfect blend of action and emotion. Absolutely loved it!",
+                "This is why I love cinema. Pure excellence.",
+                "Outstanding performances all around. A must-watch!",
+                "The soundtrack alone is worth watching for.",
+                "Incredible attention to detail. A work of art.",
+                "This will stay with me for a long time. Beautiful.",
+            ]
+            
+            # Random choices are drawn in bulk per section; review dates fall
+            # within the last 6 months
+            def review_rows(title_ids):
+                ratings = [round(random.uniform(7.5, 10.0), 1) for _ in title_ids]
+                contents = random.choices(review_contents, k=len(title_ids))
+                days_ago = random.choices(range(181), k=len(title_ids))
+                return [
+                    (bob_id, title_id, rating, content, (now - timedelta(days=days)).isoformat())
+                    for title_id, rating, content, days in zip(title_ids, ratings, contents, days_ago)
+                ]
+            
+            # Add movie reviews
+            movie_review_rows = review_rows(favorite_movies)
+            conn.executemany(
+                "INSERT INTO reviews (user_id, movie_id, rating, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                movie_review_rows
+            )
+            for _, movie_id, rating, _, _ in movie_review_rows:
+                movie_title = movie_title_by_id[movie_id]
+                print(f"  [+] Movie review: {movie_title[:50]} - Rating: {rating}/10")
+            
+            # Add show reviews
+            show_review_rows = review_rows(favorite_shows)
+            conn.executemany(
+                "INSERT INTO reviews (user_id, show_id, rating, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                show_review_rows
+            )
+            for _, show_id, rating, _, _ in show_review_rows:
+                show_title = show_title_by_id[show_id]
+                print(f"  [+] Show review: {show_title[:50]} - Rating: {rating}/10")
+            
+            # 2. Add WATCHLIST items - 15 movies, 12 shows
+            print("\n=== Adding Watchlist Items ===")
+            favorite_movie_set = set(favorite_movies)
+            favorite_show_set = set(favorite_shows)
+            watchlist_movies = random.sample([m['movie_id'] for m in movies if m['movie_id'] not in favorite_movie_set], min(15, len(movies) - len(favorite_movies)))
+            watchlist_shows = random.sample([s['show_id'] for s in shows if s['show_id'] not in favorite_show_set], min(12, len(shows) - len(favorite_shows)))
+            
+            # Add movie watchlist items; added_at is drawn inside SQLite
+            if watchlist_movies:
+                placeholders = ", ".join("(?)" for _ in watchlist_movies)
+                conn.execute(
+                    f"""
+                    WITH picks(movie_id) AS (VALUES {placeholders})
+                    INSERT OR IGNORE INTO watchlists (user_id, movie_id, show_id, added_at)
+                    SELECT ?, movie_id, NULL, datetime('now', '-' || (abs(random()) % 91) || ' days')
+                    FROM picks
+                    """,
+                    watchlist_movies + [bob_id]
+                )
+            for movie_id in watchlist_movies:
+                movie_title = movie_title_by_id[movie_id]
+                print(f"  [+] Watchlist movie: {movie_title[:50]}")
+            
+            # Add show watchlist items
+            if watchlist_shows:
+                placeholders = ", ".join("(?)" for _ in watchlist_shows)
+                conn.execute(
+                    f"""
+                    WITH picks(show_id) AS (VALUES {placeholders})
+                    INSERT OR IGNORE INTO watchlists (user_id, movie_id, show_id, added_at)
+                    SELECT ?, NULL, show_id, datetime('now', '-' || (abs(random()) % 91) || ' days')
+                    FROM picks
+                    """,
+                    watchlist_shows + [bob_id]
+                )
+            for show_id in watchlist_shows:
+                show_title = show_title_by_id[show_id]
+                print(f"  [+] Watchlist show: {show_title[:50]}")
+            
+            # 3. Add DISCUSSIONS and COMMENTS
+            print("\n=== Adding Discussions and Comments ===")
+            
+            # Create discussions for some of Bob's favorite movies/shows
+            discussion_titles = [
+                "What did you think of the ending?",
+                "Best scene in the entire series/movie?",
+                "Who was your favorite character?",
+                "The cinematography was incredible!",
+                "Anyone else catch that easter egg?",
+                "The soundtrack is amazing!",
+                "What's your theory about...?",
+                "This deserves more recognition!",
+            ]
+            
+            discussion_contents = [
+                "I've been thinking about this for days. What are your thoughts?",
+                "This really stood out to me. Anyone else feel the same?",
+                "I noticed something interesting on my rewatch. Did you catch it?",
+                "The attention to detail here is incredible!",
+                "This is one of those moments that makes the whole thing worth it.",
+                "I can't stop thinking about this scene. So powerful!",
+                "What did everyone think about this part?",
+                "This is why I love this show/movie so much!",
+            ]
+            
+            # Comments need the discussion_id each INSERT ... RETURNING hands back,
+            # so collect them and insert all of them at once after both discussion loops
+            comment_rows = []
+            
+            # Create discussions for 8 movies
+            discussion_movies = random.sample(favorite_movies, min(8, len(favorite_movies)))
+            for movie_id, title, days_ago, num_comments in zip(
+                discussion_movies,
+                random.choices(discussion_titles, k=len(discussion_movies)),
+                random.choices(range(61), k=len(discussion_movies)),
+                random.choices(range(2, 5), k=len(discussion_movies)),
+            ):
+                created_at = (now - timedelta(days=days_ago)).isoformat()
+                
+                discussion_id = conn.execute(
+                    "INSERT INTO discussions (user_id, movie_id, show_id, title, created_at) VALUES (?, ?, NULL, ?, ?) "
+                    "RETURNING discussion_id",
+                    (bob_id, movie_id, title, created_at)
+                ).fetchone()[0]
+                movie_title = movie_title_by_id[movie_id]
+                print(f"  [+] Discussion: {title} (Movie: {movie_title[:40]})")
+                
+                # Add 2-4 comments to each discussion, no older than the discussion
+                for content, comment_days_ago in zip(
+                    random.choices(discussion_contents, k=num_comments),
+                    random.choices(range(days_ago + 1), k=num_comments),
+                ):
+                    comment_created_at = (now - timedelta(days=comment_days_ago)).isoformat()
+                    comment_rows.append((discussion_id, bob_id, content, comment_created_at))
+                print(f"    -> Added {num_comments} comments")
+            
+            # Create discussions for 6 shows
+            discussion_shows = random.sample(favorite_shows, min(6, len(favorite_shows)))
+            for show_id, title, days_ago, num_comments in zip(
+                discussion_shows,
+                random.choices(discussion_titles, k=len(discussion_shows)),
+                random.choices(range(61), k=len(discussion_shows)),
+                random.choices(range(2, 5), k=len(discussion_shows)),
+            ):
+                created_at = (now - timedelta(days=days_ago)).isoformat()
+                
+                discussion_id = conn.execute(
+                    "INSERT INTO discussions (user_id, movie_id, show_id, title, created_at) VALUES (?, NULL, ?, ?, ?) "
+                    "RETURNING discussion_id",
+                    (bob_id, show_id, title, created_at)
+                ).fetchone()[0]
+                show_title = show_title_by_id[show_id]
+                print(f"  [+] Discussion: {title} (Show: {show_title[:40]})")
+                
+                # Add 2-4 comments to each discussion, no older than the discussion
+                for content, comment_days_ago in zip(
+                    random.choices(discussion_contents, k=num_comments),
+                    random.choices(range(days_ago + 1), k=num_comments),
+                ):
+                    comment_created_at = (now - timedelta(days=comment_days_ago)).isoformat()
+                    comment_rows.append((discussion_id, bob_id, content, comment_created_at))
+                print(f"    -> Added {num_comments} comments")
+            
+            conn.executemany(
                 "INSERT INTO comments (discussion_id, user_id, content, created_at) VALUES (?, ?, ?, ?)",
-                (discussion_id, bob_id, content, comment_created_at)
+                comment_rows
             )
-        print(f"    -> Added {num_comments} comments")
-    
-    conn.commit()
-    conn.close()
-    
+        
     print("\n=== Summary ===")
     print(f"[+] Added {len(favorite_movies)} movie favorites (reviews)")
     print(f"[+] Added {len(favorite_shows)} show favorites (reviews)")
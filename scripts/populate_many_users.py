@@ -14,7 +14,9 @@ Assumes:
 import sqlite3
 import random
 import sys
+from collections import defaultdict
 from datetime import datetime, timedelta
+from itertools import combinations
 from pathlib import Path
 
 # ---------------------------------------------------------------------
@@ -46,6 +48,9 @@ LAST_NAMES = [
 
 REACTION_TYPES = ["👍", "❤️", "😂", "😮", "😢", "🔥"]
 
+# Every distinct set of 1, 2 or 3 emotes, keyed by set size
+EMOTE_COMBOS = {n: list(combinations(REACTION_TYPES, n)) for n in (1, 2, 3)}
+
 # Maps TMDb genre names to a nicer phrase to drop into review text
 GENRE_NICKNAMES = {
     "Action": "action",
@@ -92,20 +97,70 @@ NEGATIVE_TEMPLATES = [
     "Not terrible, just not my thing.",
 ]
 
+SENTIMENTS = ["positive", "neutral", "negative"]
+
+# Rating range (low, high) for each sentiment
+RATING_RANGES = {
+    "positive": (8.3, 10.0),
+    "neutral": (6.0, 8.0),
+    "negative": (3.0, 6.5),  # negative / lukewarm
+}
+
+TEMPLATES_BY_SENTIMENT = {
+    "positive": POSITIVE_TEMPLATES,
+    "neutral": NEUTRAL_TEMPLATES,
+    "negative": NEGATIVE_TEMPLATES,
+}
+
+# Statements run once per user. Keeping each as a single module-level
+# string means every call hits the connection's prepared-statement cache.
+SQL_INSERT_REVIEW = (
+    "INSERT INTO reviews (user_id, movie_id, show_id, rating, content, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_LAST_INSERT_ROWID = "SELECT last_insert_rowid()"
+# Favorites and watchlist rows carry both title columns, one of them None
+SQL_INSERT_FAVORITE = (
+    "INSERT OR IGNORE INTO favorites "
+    "(user_id, movie_id, show_id, added_at) "
+    "VALUES (?, ?, ?, ?)"
+)
+SQL_INSERT_WATCHLIST = (
+    "INSERT OR IGNORE INTO watchlists "
+    "(user_id, movie_id, show_id, added_at) "
+    "VALUES (?, ?, ?, ?)"
+)
+SQL_INSERT_REACTION = (
+    "INSERT OR IGNORE INTO review_reactions "
+    "(review_id, user_id, emote_type, created_at) "
+    "VALUES (?, ?, ?, ?)"
+)
+
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
 
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+    # Autocommit mode: populate_demo_users manages its own BEGIN/COMMIT
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    # WAL + NORMAL sync: one fsync per checkpoint instead of per commit;
+    # a large page cache and mmap keep the bulk load off the disk
+    conn.executescript(
+        "PRAGMA journal_mode = WAL;"
+        "PRAGMA synchronous = NORMAL;"
+        "PRAGMA temp_store = MEMORY;"
+        "PRAGMA cache_size = -200000;"
+        "PRAGMA mmap_size = 268435456;"
+        "PRAGMA busy_timeout = 30000;"
+        "PRAGMA foreign_keys = ON;"
+    )
     return conn
 
 
 def ensure_tables(conn: sqlite3.Connection) -> None:
-    """Ensure favorites and review_reactions tables exist (for safety)."""
+    """Ensure favorites and review_reactions tables and per-user review indexes exist."""
 
     # favorites
     try:
@@ -145,6 +200,15 @@ def ensure_tables(conn: sqlite3.Connection) -> None:
         conn.commit()
         print("[info] Created review_reactions table")
 
+    # Lookups of a user's review for a title (the backend's duplicate-review
+    # check); favorites is already keyed by (user_id, movie_id, show_id)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reviews_user_movie ON reviews(user_id, movie_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reviews_user_show ON reviews(user_id, show_id)"
+    )
+
 
 def generate_email(first_name: str, last_name: str, domain: str = "example.com") -> str:
     base = f"{first_name.lower()}.{last_name.lower()}"
@@ -153,59 +217,121 @@ def generate_email(first_name: str, last_name: str, domain: str = "example.com")
     return f"{base}@{domain}"
 
 
-def create_user(conn: sqlite3.Connection, first_name: str, last_name: str) -> int:
-    """Create a new user if the email doesn't already exist, return user_id."""
-    email = generate_email(first_name, last_name)
-
-    existing = conn.execute(
-        "SELECT user_id FROM users WHERE lower(email) = lower(?) LIMIT 1",
-        (email,),
-    ).fetchone()
-    if existing:
-        return existing["user_id"]
-
-    display_name = f"{first_name} {last_name}"
-    days_ago = random.randint(0, 365)
-    created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
+def create_users(
+    conn: sqlite3.Connection, num_users: int, iso_days_ago
+) -> list[tuple[int, str]]:
+    """
+    Create num_users random users in one executemany and return
+    (user_id, name) for each. A generated email that already exists
+    (case-insensitively), in the database or earlier in this batch, reuses
+    that user instead of creating a new one.
+    """
+    user_ids_by_email = {
+        email.lower(): user_id
+        for user_id, email in conn.execute("SELECT user_id, email FROM users")
+    }
 
-    cur = conn.execute(
+    names: list[tuple[str, str]] = []
+    new_emails: set[str] = set()
+    new_rows = []
+    for _ in range(num_users):
+        first = random.choice(FIRST_NAMES)
+        last = random.choice(LAST_NAMES)
+        email = generate_email(first, last)
+        key = email.lower()
+        names.append((key, f"{first} {last}"))
+
+        if key in user_ids_by_email or key in new_emails:
+            continue
+        new_emails.add(key)
+        days_ago = random.randint(0, 365)
+        new_rows.append((email, f"{first} {last}", iso_days_ago[days_ago]))
+
+    # New rows get rowids above the current maximum; read them back in one query
+    last_user_id = conn.execute(
+        "SELECT COALESCE(MAX(user_id), 0) FROM users"
+    ).fetchone()[0]
+    conn.executemany(
         "INSERT INTO users (email, display_name, created_at) VALUES (?, ?, ?)",
-        (email, display_name, created_at),
+        new_rows,
     )
-    return cur.lastrowid
+    for user_id, email in conn.execute(
+        "SELECT user_id, email FROM users WHERE user_id > ?", (last_user_id,)
+    ):
+        user_ids_by_email[email.lower()] = user_id
+
+    return [(user_ids_by_email[key], name) for key, name in names]
 
 
 def load_media(conn: sqlite3.Connection):
     """Load a pool of popular movies and shows with their genres."""
-    movies = conn.execute(
-        """
-        SELECT m.movie_id,
-               m.title,
-               GROUP_CONCAT(g.name, ', ') AS genres
-        FROM movies m
-        LEFT JOIN movie_genres mg ON m.movie_id = mg.movie_id
-        LEFT JOIN genres g ON mg.genre_id = g.genre_id
-        GROUP BY m.movie_id
-        ORDER BY m.popularity DESC
-        LIMIT 300
-        """
-    ).fetchall()
+    movies, movie_genres = load_media_pool(
+        conn, "movies", "movie_id", "movie_genres", limit=300
+    )
+    shows, show_genres = load_media_pool(
+        conn, "shows", "show_id", "show_genres", limit=200
+    )
+
+    return (
+        prepare_media(movies, movie_genres, "movie_id"),
+        prepare_media(shows, show_genres, "show_id"),
+    )
+
 
-    shows = conn.execute(
-        """
-        SELECT s.show_id,
-               s.title,
-               GROUP_CONCAT(g.name, ', ') AS genres
-        FROM shows s
-        LEFT JOIN show_genres sg ON s.show_id = sg.show_id
-        LEFT JOIN genres g ON sg.genre_id = g.genre_id
-        GROUP BY s.show_id
-        ORDER BY s.popularity DESC
-        LIMIT 200
-        """
+def load_media_pool(
+    conn: sqlite3.Connection, table: str, id_col: str, genre_table: str, limit: int
+):
+    """
+    Fetch the `limit` most popular titles from `table`, then their
+    (id, genre name) pairs in a second query, bucketed by id in Python.
+    That avoids GROUP_CONCAT building a string that would only be split
+    apart again.
+    """
+    pool_ids = f"SELECT {id_col} FROM {table} ORDER BY popularity DESC LIMIT ?"
+    rows = conn.execute(
+        f"SELECT {id_col}, title FROM {table} ORDER BY popularity DESC LIMIT ?",
+        (limit,),
     ).fetchall()
 
-    return movies, shows
+    genres_by_id: dict[int, list[str]] = defaultdict(list)
+    for title_id, name in conn.execute(
+        f"""
+        SELECT tg.{id_col}, g.name
+        FROM {genre_table} tg
+        JOIN genres g ON g.genre_id = tg.genre_id
+        WHERE tg.{id_col} IN ({pool_ids})
+        ORDER BY tg.{id_col}, tg.genre_id
+        """,
+        (limit,),
+    ):
+        genres_by_id[title_id].append(name)
+
+    return rows, genres_by_id
+
+
+def prepare_media(rows, genres_by_id, id_key: str) -> list[dict]:
+    """
+    Parse each title's genres once into a frozenset for taste matching, and
+    render every review template for the title up front, so drafting a
+    review is a dict lookup rather than a str.format call.
+    """
+    media = []
+    for row in rows:
+        genres = genres_by_id.get(row[id_key], [])
+        genre_word = genre_to_word(genres)
+        media.append(
+            {
+                id_key: row[id_key],
+                "title": row["title"],
+                "genres_set": frozenset(genres),
+                "review_texts": {
+                    template: template.format(title=row["title"], genre=genre_word)
+                    for templates in TEMPLATES_BY_SENTIMENT.values()
+                    for template in templates
+                },
+            }
+        )
+    return media
 
 
 def load_all_genres(conn: sqlite3.Connection):
@@ -229,12 +355,6 @@ def create_user_profile(all_genres):
     }
 
 
-def parse_genres(row) -> list[str]:
-    if row["genres"]:
-        return [g.strip() for g in row["genres"].split(",") if g.strip()]
-    return []
-
-
 def genre_to_word(genres: list[str]) -> str:
     for g in genres:
         if g in GENRE_NICKNAMES:
@@ -242,11 +362,10 @@ def genre_to_word(genres: list[str]) -> str:
     return genres[0].lower() if genres else "story"
 
 
-def choose_sentiment(profile, item_genres: list[str]) -> str:
-    """Choose 'positive', 'neutral', or 'negative' based on user taste vs genres."""
-    item_genres_set = set(item_genres)
-    likes = profile["favorite_genres"].intersection(item_genres_set)
-    dislikes = profile["disliked_genres"].intersection(item_genres_set)
+def sentiment_weights(profile, item_genres: frozenset[str]) -> tuple:
+    """Weights for 'positive', 'neutral', 'negative' given user taste vs genres."""
+    likes = profile["favorite_genres"].intersection(item_genres)
+    dislikes = profile["disliked_genres"].intersection(item_genres)
 
     if likes and not dislikes:
         weights = (0.75, 0.2, 0.05)
@@ -257,29 +376,103 @@ def choose_sentiment(profile, item_genres: list[str]) -> str:
     else:
         weights = (0.45, 0.4, 0.15)
 
-    return random.choices(["positive", "neutral", "negative"], weights=weights, k=1)[0]
+    return weights
+
+
+def choose_sentiments(profile, items) -> list[str]:
+    """
+    Choose a sentiment for each item. Items are grouped by weight regime so
+    there is one random.choices call per regime instead of one per item.
+    """
+    groups: dict[tuple, list[int]] = {}
+    for i, item in enumerate(items):
+        groups.setdefault(sentiment_weights(profile, item["genres_set"]), []).append(i)
 
+    sentiments = [None] * len(items)
+    for weights, indices in groups.items():
+        drawn = random.choices(SENTIMENTS, weights=weights, k=len(indices))
+        for i, sentiment in zip(indices, drawn):
+            sentiments[i] = sentiment
+    return sentiments
 
-def pick_rating(sentiment: str) -> float:
+
+def pick_rating(sentiment: str, uniform=random.uniform) -> float:
     """Turn sentiment into a numeric rating."""
-    if sentiment == "positive":
-        low, high = 8.3, 10.0
-    elif sentiment == "neutral":
-        low, high = 6.0, 8.0
-    else:  # negative / lukewarm
-        low, high = 3.0, 6.5
-    return round(random.uniform(low, high), 1)
-
-
-def build_review_text(title: str, item_genres: list[str], sentiment: str) -> str:
-    genre_word = genre_to_word(item_genres)
-    if sentiment == "positive":
-        template = random.choice(POSITIVE_TEMPLATES)
-    elif sentiment == "neutral":
-        template = random.choice(NEUTRAL_TEMPLATES)
-    else:
-        template = random.choice(NEGATIVE_TEMPLATES)
-    return template.format(title=title, genre=genre_word)
+    # uniform is bound once at definition time, so the per-review call
+    # skips the global + attribute lookup of random.uniform
+    low, high = RATING_RANGES[sentiment]
+    return round(uniform(low, high), 1)
+
+
+def draft_reviews(profile, items, iso_days_ago) -> list[tuple[float, str, str]]:
+    """
+    Build (rating, content, created_at) for each item, drawing sentiments,
+    templates and dates a batch at a time.
+    """
+    sentiments = choose_sentiments(profile, items)
+    templates = {
+        sentiment: iter(random.choices(options, k=sentiments.count(sentiment)))
+        for sentiment, options in TEMPLATES_BY_SENTIMENT.items()
+    }
+    days = random.choices(range(181), k=len(items))
+
+    drafts = []
+    for item, sentiment, days_ago in zip(items, sentiments, days):
+        rating = pick_rating(sentiment)
+        content = item["review_texts"][next(templates[sentiment])]
+        drafts.append((rating, content, iso_days_ago[days_ago]))
+    return drafts
+
+
+def new_user_history() -> dict:
+    """Empty per-user record of reviewed and favorited titles."""
+    return {
+        "reviews": [],  # (movie_id, show_id, rating)
+        "reviewed_movie_ids": set(),
+        "reviewed_show_ids": set(),
+        "favorited_movie_ids": set(),
+        "favorited_show_ids": set(),
+    }
+
+
+def load_user_histories(conn: sqlite3.Connection, user_ids) -> dict:
+    """
+    Load existing reviews and favorites for user_ids in one pass each.
+    populate_user_data keeps these records current as it inserts, so it
+    never has to read the user's rows back from the database.
+    """
+    histories = {user_id: new_user_history() for user_id in user_ids}
+
+    # Rows are unpacked positionally; sqlite3.Row name lookups scan the
+    # column list on every access
+    reviews = conn.execute("SELECT user_id, movie_id, show_id, rating FROM reviews")
+    for user_id, movie_id, show_id, rating in reviews:
+        history = histories.get(user_id)
+        if history is None:
+            continue
+        history["reviews"].append((movie_id, show_id, rating))
+        if movie_id is not None:
+            history["reviewed_movie_ids"].add(movie_id)
+        if show_id is not None:
+            history["reviewed_show_ids"].add(show_id)
+
+    favorites = conn.execute("SELECT user_id, movie_id, show_id FROM favorites")
+    for user_id, movie_id, show_id in favorites:
+        history = histories.get(user_id)
+        if history is None:
+            continue
+        if movie_id is not None:
+            history["favorited_movie_ids"].add(movie_id)
+        if show_id is not None:
+            history["favorited_show_ids"].add(show_id)
+
+    return histories
+
+
+def build_iso_days_ago(max_days: int) -> list[str]:
+    """ISO timestamps for 0..max_days days before now, indexed by days ago."""
+    now = datetime.now()
+    return [(now - timedelta(days=d)).isoformat() for d in range(max_days + 1)]
 
 
 def choose_n_for_seq(length: int, typical_min: int, typical_max: int) -> int:
@@ -299,11 +492,13 @@ def choose_n_for_seq(length: int, typical_min: int, typical_max: int) -> int:
 def populate_user_data(
     conn: sqlite3.Connection,
     user_id: int,
-    movies,
-    shows,
+    movies_by_id,
+    shows_by_id,
     all_reviews,
     all_user_ids,
     profile,
+    history,
+    iso_days_ago,
 ):
     stats = {"reviews": 0, "favorites": 0, "watchlist": 0, "reactions": 0}
 
@@ -326,73 +521,65 @@ def populate_user_data(
         num_movie_reviews = random.randint(25, 40)
         num_show_reviews = random.randint(18, 30)
 
-    # Which titles has this user already reviewed?
-    reviewed_movie_ids = {
-        r[0]
-        for r in conn.execute(
-            "SELECT movie_id FROM reviews WHERE user_id = ? AND movie_id IS NOT NULL",
-            (user_id,),
-        ).fetchall()
-    }
-    reviewed_show_ids = {
-        r[0]
-        for r in conn.execute(
-            "SELECT show_id FROM reviews WHERE user_id = ? AND show_id IS NOT NULL",
-            (user_id,),
-        ).fetchall()
-    }
-
-    available_movies = [m for m in movies if m["movie_id"] not in reviewed_movie_ids]
-    available_shows = [s for s in shows if s["show_id"] not in reviewed_show_ids]
-
-    chosen_movies = random.sample(
-        available_movies, min(num_movie_reviews, len(available_movies))
-    )
-    chosen_shows = random.sample(
-        available_shows, min(num_show_reviews, len(available_shows))
-    )
-
-    # --- Reviews (movies) ---
-    for movie in chosen_movies:
-        genres = parse_genres(movie)
-        sentiment = choose_sentiment(profile, genres)
-        rating = pick_rating(sentiment)
-        content = build_review_text(movie["title"], genres, sentiment)
-
-        days_ago = random.randint(0, 180)
-        created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
+    # Which titles has this user already reviewed? (updated below as
+    # reviews and favorites are added)
+    reviewed_movie_ids = history["reviewed_movie_ids"]
+    # all_reviews already holds exactly these earlier reviews of this user
+    prior_review_count = len(history["reviews"])
+    reviewed_show_ids = history["reviewed_show_ids"]
+    favorited_movie_ids = history["favorited_movie_ids"]
+    favorited_show_ids = history["favorited_show_ids"]
+
+    # Filter and sample bare ids; only the chosen titles are looked up
+    available_movie_ids = [mid for mid in movies_by_id if mid not in reviewed_movie_ids]
+    available_show_ids = [sid for sid in shows_by_id if sid not in reviewed_show_ids]
+
+    chosen_movies = [
+        movies_by_id[mid]
+        for mid in random.sample(
+            available_movie_ids, min(num_movie_reviews, len(available_movie_ids))
+        )
+    ]
+    chosen_shows = [
+        shows_by_id[sid]
+        for sid in random.sample(
+            available_show_ids, min(num_show_reviews, len(available_show_ids))
+        )
+    ]
 
-        conn.execute(
-            "INSERT INTO reviews (user_id, movie_id, rating, content, created_at) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (user_id, movie["movie_id"], rating, content, created_at),
+    # Rows are collected per table and written with one executemany each;
+    # timestamps come from iso_days_ago, indexed by how many days back
+
+    # --- Reviews (movies and shows, one statement for both) ---
+    chosen = chosen_movies + chosen_shows
+    review_rows = []
+    for item, (rating, content, created_at) in zip(
+        chosen, draft_reviews(profile, chosen, iso_days_ago)
+    ):
+        movie_id = item.get("movie_id")
+        show_id = item.get("show_id")
+        review_rows.append(
+            (user_id, movie_id, show_id, rating, content, created_at)
         )
-        stats["reviews"] += 1
+        if movie_id is not None:
+            reviewed_movie_ids.add(movie_id)
+        else:
+            reviewed_show_ids.add(show_id)
+        history["reviews"].append((movie_id, show_id, rating))
 
-    # --- Reviews (shows) ---
-    for show in chosen_shows:
-        genres = parse_genres(show)
-        sentiment = choose_sentiment(profile, genres)
-        rating = pick_rating(sentiment)
-        content = build_review_text(show["title"], genres, sentiment)
+    conn.executemany(SQL_INSERT_REVIEW, review_rows)
+    stats["reviews"] += len(review_rows)
 
-        days_ago = random.randint(0, 180)
-        created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
-
-        conn.execute(
-            "INSERT INTO reviews (user_id, show_id, rating, content, created_at) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (user_id, show["show_id"], rating, content, created_at),
-        )
-        stats["reviews"] += 1
+    # This script is the only writer inside its transaction, so one
+    # executemany into the INTEGER PRIMARY KEY table assigns contiguous ids
+    # ending at last_insert_rowid()
+    last_review_id = conn.execute(SQL_LAST_INSERT_ROWID).fetchone()[0]
+    new_review_ids = range(last_review_id - len(review_rows) + 1, last_review_id + 1)
 
     # --- Favorites (from this user's own reviews) ---
-    user_reviews = conn.execute(
-        "SELECT movie_id, show_id, rating FROM reviews WHERE user_id = ?",
-        (user_id,),
-    ).fetchall()
+    user_reviews = history["reviews"]
 
-    high_rated = [r for r in user_reviews if r["rating"] >= 8.0]
+    high_rated = [r for r in user_reviews if r[2] >= 8.0]
     base_pool = high_rated if high_rated else user_reviews
 
     n_fav = choose_n_for_seq(len(base_pool), typical_min=3, typical_max=15)
@@ -400,138 +587,103 @@ def populate_user_data(
         random.sample(base_pool, n_fav) if n_fav > 0 else []
     )
 
-    for r in favorite_rows:
-        movie_id = r["movie_id"]
-        show_id = r["show_id"]
-        days_ago = random.randint(0, 90)
-        added_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
+    favorite_days = random.choices(range(91), k=len(favorite_rows))
+    favorite_inserts = [
+        (user_id, movie_id, show_id, iso_days_ago[days_ago])
+        for (movie_id, show_id, _), days_ago in zip(favorite_rows, favorite_days)
+    ]
+    favorited_movie_ids.update(r[0] for r in favorite_rows if r[0] is not None)
+    favorited_show_ids.update(r[1] for r in favorite_rows if r[1] is not None)
 
-        try:
-            if movie_id is not None:
-                conn.execute(
-                    "INSERT OR IGNORE INTO favorites "
-                    "(user_id, movie_id, show_id, added_at) "
-                    "VALUES (?, ?, NULL, ?)",
-                    (user_id, movie_id, added_at),
-                )
-            elif show_id is not None:
-                conn.execute(
-                    "INSERT OR IGNORE INTO favorites "
-                    "(user_id, movie_id, show_id, added_at) "
-                    "VALUES (?, NULL, ?, ?)",
-                    (user_id, show_id, added_at),
-                )
-            stats["favorites"] += 1
-        except sqlite3.IntegrityError:
-            # unique constraint hit; ignore
-            pass
+    # OR IGNORE skips titles that are already favorites
+    conn.executemany(SQL_INSERT_FAVORITE, favorite_inserts)
+    stats["favorites"] += len(favorite_inserts)
 
     # --- Watchlists (things not yet reviewed or favorited) ---
-    favorited_movie_ids = {
-        r[0]
-        for r in conn.execute(
-            "SELECT movie_id FROM favorites "
-            "WHERE user_id = ? AND movie_id IS NOT NULL",
-            (user_id,),
-        ).fetchall()
-    }
-    favorited_show_ids = {
-        r[0]
-        for r in conn.execute(
-            "SELECT show_id FROM favorites "
-            "WHERE user_id = ? AND show_id IS NOT NULL",
-            (user_id,),
-        ).fetchall()
-    }
-
-    watchlist_movie_rows = [
-        m
-        for m in movies
-        if m["movie_id"] not in reviewed_movie_ids
-        and m["movie_id"] not in favorited_movie_ids
+    watchlist_movie_ids = [
+        mid
+        for mid in movies_by_id
+        if mid not in reviewed_movie_ids and mid not in favorited_movie_ids
     ]
-    watchlist_show_rows = [
-        s
-        for s in shows
-        if s["show_id"] not in reviewed_show_ids
-        and s["show_id"] not in favorited_show_ids
+    watchlist_show_ids = [
+        sid
+        for sid in shows_by_id
+        if sid not in reviewed_show_ids and sid not in favorited_show_ids
     ]
 
-    n_watch_movies = choose_n_for_seq(len(watchlist_movie_rows), 3, 15)
-    n_watch_shows = choose_n_for_seq(len(watchlist_show_rows), 2, 12)
+    n_watch_movies = choose_n_for_seq(len(watchlist_movie_ids), 3, 15)
+    n_watch_shows = choose_n_for_seq(len(watchlist_show_ids), 2, 12)
 
     watchlist_movies = (
-        random.sample(watchlist_movie_rows, n_watch_movies)
+        random.sample(watchlist_movie_ids, n_watch_movies)
         if n_watch_movies > 0
         else []
     )
     watchlist_shows = (
-        random.sample(watchlist_show_rows, n_watch_shows)
+        random.sample(watchlist_show_ids, n_watch_shows)
         if n_watch_shows > 0
         else []
     )
 
-    for movie in watchlist_movies:
-        days_ago = random.randint(0, 90)
-        added_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
-        try:
-            conn.execute(
-                "INSERT OR IGNORE INTO watchlists "
-                "(user_id, movie_id, show_id, added_at) "
-                "VALUES (?, ?, NULL, ?)",
-                (user_id, movie["movie_id"], added_at),
-            )
-            stats["watchlist"] += 1
-        except sqlite3.IntegrityError:
-            pass
+    watchlist_inserts = [
+        (user_id, movie_id, None, iso_days_ago[days_ago])
+        for movie_id, days_ago in zip(
+            watchlist_movies, random.choices(range(91), k=len(watchlist_movies))
+        )
+    ]
+    watchlist_inserts += [
+        (user_id, None, show_id, iso_days_ago[days_ago])
+        for show_id, days_ago in zip(
+            watchlist_shows, random.choices(range(91), k=len(watchlist_shows))
+        )
+    ]
 
-    for show in watchlist_shows:
-        days_ago = random.randint(0, 90)
-        added_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
-        try:
-            conn.execute(
-                "INSERT OR IGNORE INTO watchlists "
-                "(user_id, movie_id, show_id, added_at) "
-                "VALUES (?, NULL, ?, ?)",
-                (user_id, show["show_id"], added_at),
-            )
-            stats["watchlist"] += 1
-        except sqlite3.IntegrityError:
-            pass
+    conn.executemany(SQL_INSERT_WATCHLIST, watchlist_inserts)
+    stats["watchlist"] += len(watchlist_inserts)
 
     # --- Review reactions (react to other users' reviews) ---
-    if all_reviews:
-        other_reviews = [r for r in all_reviews if r["user_id"] != user_id]
-        if other_reviews:
-            max_react = min(30, len(other_reviews))
-            min_react = min(5, max_react)
-            num_reactions = random.randint(min_react, max_react)
-
-            target_reviews = random.sample(other_reviews, num_reactions)
-            for review in target_reviews:
-                # 1–3 emotes per review
-                num_emotes = random.choices(
-                    [1, 2, 3], weights=[0.6, 0.3, 0.1]
-                )[0]
-                emotes = random.sample(
-                    REACTION_TYPES, min(num_emotes, len(REACTION_TYPES))
-                )
-                for emote in emotes:
-                    try:
-                        days_ago = random.randint(0, 60)
-                        created_at = (
-                            datetime.now() - timedelta(days=days_ago)
-                        ).isoformat()
-                        conn.execute(
-                            "INSERT INTO review_reactions "
-                            "(review_id, user_id, emote_type, created_at) "
-                            "VALUES (?, ?, ?, ?)",
-                            (review["review_id"], user_id, emote, created_at),
-                        )
-                        stats["reactions"] += 1
-                    except sqlite3.IntegrityError:
-                        # already reacted with this emote
-                        pass
+    # all_reviews holds (review_id, user_id) tuples
+    other_review_count = len(all_reviews) - prior_review_count
+    if other_review_count > 0:
+        max_react = min(30, other_review_count)
+        min_react = min(5, max_react)
+        num_reactions = random.randint(min_react, max_react)
+
+        # Sample positions rather than copying every other user's review
+        # into a new list. Over-drawing by the user's own review count
+        # leaves num_reactions picks after their own are dropped.
+        picks = random.sample(
+            range(len(all_reviews)),
+            min(len(all_reviews), num_reactions + prior_review_count),
+        )
+        target_reviews = [
+            all_reviews[i] for i in picks if all_reviews[i][1] != user_id
+        ][:num_reactions]
+
+        # 1–3 emotes per review. Each review gets a uniformly random set of
+        # that size, drawn with one random.choices call per size rather
+        # than a random.sample per review.
+        emote_counts = random.choices(
+            [1, 2, 3], weights=[0.6, 0.3, 0.1], k=num_reactions
+        )
+        emote_sets = {
+            n: iter(random.choices(combos, k=emote_counts.count(n)))
+            for n, combos in EMOTE_COMBOS.items()
+        }
+        reaction_days = iter(random.choices(range(61), k=sum(emote_counts)))
+        reaction_rows = [
+            (review_id, user_id, emote, iso_days_ago[next(reaction_days)])
+            for (review_id, _), num_emotes in zip(target_reviews, emote_counts)
+            for emote in next(emote_sets[num_emotes])
+        ]
+
+        # OR IGNORE skips emotes this user already left on a review;
+        # rowcount only counts the rows actually inserted
+        cur = conn.executemany(SQL_INSERT_REACTION, reaction_rows)
+        stats["reactions"] += cur.rowcount
+
+    # Make this user's reviews available to the users populated after them
+    all_reviews.extend((review_id, user_id) for review_id in new_review_ids)
 
     return stats
 
@@ -553,55 +705,69 @@ def populate_demo_users(num_users: int = 20) -> None:
     all_genres = load_all_genres(conn)
     print(f"[info] Using {len(movies)} movies, {len(shows)} shows, {len(all_genres)} genres")
 
-    # Create users first
-    created_users: list[tuple[int, str]] = []
-    for i in range(num_users):
-        first = random.choice(FIRST_NAMES)
-        last = random.choice(LAST_NAMES)
-        user_id = create_user(conn, first, last)
-        created_users.append((user_id, f"{first} {last}"))
-
-    conn.commit()
-    print(f"[info] Created {len(created_users)} users")
-
-    # Preload existing reviews for reactions
-    all_reviews_rows = conn.execute(
-        "SELECT review_id, user_id FROM reviews"
-    ).fetchall()
-    all_reviews = [dict(r) for r in all_reviews_rows]
+    # All users and their data are written in one transaction: a single
+    # commit at the end instead of one per implicit transaction
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Every generated timestamp is a lookup into this table rather than
+        # a datetime/timedelta/isoformat round trip per row
+        iso_days_ago = build_iso_days_ago(365)
 
-    all_user_ids = [
-        r[0] for r in conn.execute("SELECT user_id FROM users").fetchall()
-    ]
+        # Create users first
+        created_users = create_users(conn, num_users, iso_days_ago)
 
-    totals = {"reviews": 0, "favorites": 0, "watchlist": 0, "reactions": 0}
+        print(f"[info] Created {len(created_users)} users")
 
-    print("[info] Populating per-user data...")
-    for idx, (user_id, name) in enumerate(created_users, start=1):
-        profile = create_user_profile(all_genres)
-        stats = populate_user_data(
-            conn, user_id, movies, shows, all_reviews, all_user_ids, profile
-        )
+        # Existing reviews/favorites of the users being populated
+        movies_by_id = {m["movie_id"]: m for m in movies}
+        shows_by_id = {s["show_id"]: s for s in shows}
 
-        for k in totals:
-            totals[k] += stats[k]
+        histories = load_user_histories(conn, {user_id for user_id, _ in created_users})
 
-        new_reviews = conn.execute(
-            "SELECT review_id, user_id FROM reviews WHERE user_id = ?",
-            (user_id,),
+        # Preload existing reviews for reactions
+        all_reviews_rows = conn.execute(
+            "SELECT review_id, user_id FROM reviews"
         ).fetchall()
-        all_reviews.extend(dict(r) for r in new_reviews)
-
-        if idx % 5 == 0 or idx == len(created_users):
-            print(
-                f"  - {idx}/{len(created_users)} users done "
-                f"(reviews={totals['reviews']}, "
-                f"favorites={totals['favorites']}, "
-                f"watchlist={totals['watchlist']}, "
-                f"reactions={totals['reactions']})"
+        all_reviews = [tuple(r) for r in all_reviews_rows]
+
+        all_user_ids = [
+            r[0] for r in conn.execute("SELECT user_id FROM users").fetchall()
+        ]
+
+        totals = {"reviews": 0, "favorites": 0, "watchlist": 0, "reactions": 0}
+
+        print("[info] Populating per-user data...")
+        for idx, (user_id, name) in enumerate(created_users, start=1):
+            profile = create_user_profile(all_genres)
+            stats = populate_user_data(
+                conn,
+                user_id,
+                movies_by_id,
+                shows_by_id,
+                all_reviews,
+                all_user_ids,
+                profile,
+                histories[user_id],
+                iso_days_ago,
             )
 
-    conn.commit()
+            for k in totals:
+                totals[k] += stats[k]
+
+            if idx % 5 == 0 or idx == len(created_users):
+                print(
+                    f"  - {idx}/{len(created_users)} users done "
+                    f"(reviews={totals['reviews']}, "
+                    f"favorites={totals['favorites']}, "
+                    f"watchlist={totals['watchlist']}, "
+                    f"reactions={totals['reactions']})"
+                )
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    # Fold the load back into the main file and shrink the WAL to zero
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
     conn.close()
 
     print("\n[done] Demo population complete")
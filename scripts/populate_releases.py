@@ -9,6 +9,7 @@ Uses TMDb Discover API with date filters to fetch:
 """
 
 import logging
+import math
 import os
 import sys
 import yaml
@@ -45,6 +46,9 @@ FUTURE_SHOWS_LIMIT = 50
 NEW_MOVIES_LIMIT = 50
 NEW_SHOWS_LIMIT = 50
 
+# Titles first loaded within this many days are not re-fetched on reruns (0 re-fetches all)
+SKIP_RECENT_DAYS = 7
+
 
 def load_config():
     """Load ETL configuration"""
@@ -54,7 +58,58 @@ def load_config():
         sys.exit(1)
     
     with open(config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        # Use libyaml's C loader when PyYAML was built with it
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def _discover_pages(etl_service: TMDbETLService, path: str, params: dict, limit: int, kind: str,
+                    max_pages: int = 10):
+    """
+    Fetch enough Discover result pages to cover limit, in page order
+    
+    Page 1 is fetched first to learn the page size and total_pages; the
+    remaining pages are then fetched concurrently on the ETL service's
+    fetch pool, which shares its global rate limit. TMDb typically returns
+    20 per page, so 10 pages = 200 max.
+    """
+    def fetch(page):
+        return etl_service._api_get(path, page=page, **params)
+    
+    try:
+        response = fetch(1)
+    except Exception as e:
+        logger.error(f"Error fetching {kind} page 1: {e}")
+        return []
+    
+    results = response.get('results', [])
+    fetched = list(results)
+    if not results:
+        return fetched
+    logger.info(f"Fetched page 1: {len(results)} {kind} (total: {len(fetched)})")
+    
+    last_page = min(max_pages, response.get('total_pages', 1), math.ceil(limit / len(results)))
+    futures = [
+        (page, etl_service._executor.submit(fetch, page))
+        for page in range(2, last_page + 1)
+    ]
+    for page, future in futures:
+        try:
+            results = future.result().get('results', [])
+        except Exception as e:
+            logger.error(f"Error fetching {kind} page {page}: {e}")
+            break
+        
+        if not results:
+            break
+        
+        fetched.extend(results)
+        logger.info(f"Fetched page {page}: {len(results)} {kind} (total: {len(fetched)})")
+    
+    # Don't leave pages past a failure running on the shared pool
+    for _, future in futures:
+        future.cancel()
+    
+    return fetched
 
 
 def discover_movies_by_date(etl_service: TMDbETLService, start_date: str, end_date: str = None, limit: int = 50):
@@ -69,40 +124,14 @@ def discover_movies_by_date(etl_service: TMDbETLService, start_date: str, end_da
     """
     logger.info(f"Discovering movies from {start_date} to {end_date or 'future'}...")
     
-    movies_fetched = []
-    page = 1
-    max_pages = 10  # TMDb typically returns 20 per page, so 10 pages = 200 max
-    
-    while len(movies_fetched) < limit and page <= max_pages:
-        try:
-            params = {
-                'primary_release_date.gte': start_date,
-                'sort_by': 'popularity.desc',
-                'page': page
-            }
-            
-            if end_date:
-                params['primary_release_date.lte'] = end_date
-            
-            response = etl_service._api_get('/discover/movie', **params)
-            results = response.get('results', [])
-            
-            if not results:
-                break
-            
-            movies_fetched.extend(results)
-            logger.info(f"Fetched page {page}: {len(results)} movies (total: {len(movies_fetched)})")
-            
-            # Check if there are more pages
-            if page >= response.get('total_pages', 1):
-                break
-            
-            page += 1
-            
-        except Exception as e:
-            logger.error(f"Error fetching movies page {page}: {e}")
-            break
+    params = {
+        'primary_release_date.gte': start_date,
+        'sort_by': 'popularity.desc',
+    }
+    if end_date:
+        params['primary_release_date.lte'] = end_date
     
+    movies_fetched = _discover_pages(etl_service, '/discover/movie', params, limit, 'movies')
     logger.info(f"Total movies discovered: {len(movies_fetched)}")
     return movies_fetched[:limit]
 
@@ -119,197 +148,194 @@ def discover_shows_by_date(etl_service: TMDbETLService, start_date: str, end_dat
     """
     logger.info(f"Discovering TV shows from {start_date} to {end_date or 'future'}...")
     
-    shows_fetched = []
-    page = 1
-    max_pages = 10
-    
-    while len(shows_fetched) < limit and page <= max_pages:
-        try:
-            params = {
-                'first_air_date.gte': start_date,
-                'sort_by': 'popularity.desc',
-                'page': page
-            }
-            
-            if end_date:
-                params['first_air_date.lte'] = end_date
-            
-            response = etl_service._api_get('/discover/tv', **params)
-            results = response.get('results', [])
-            
-            if not results:
-                break
-            
-            shows_fetched.extend(results)
-            logger.info(f"Fetched page {page}: {len(results)} shows (total: {len(shows_fetched)})")
-            
-            # Check if there are more pages
-            if page >= response.get('total_pages', 1):
-                break
-            
-            page += 1
-            
-        except Exception as e:
-            logger.error(f"Error fetching shows page {page}: {e}")
-            break
+    params = {
+        'first_air_date.gte': start_date,
+        'sort_by': 'popularity.desc',
+    }
+    if end_date:
+        params['first_air_date.lte'] = end_date
     
+    shows_fetched = _discover_pages(etl_service, '/discover/tv', params, limit, 'shows')
     logger.info(f"Total shows discovered: {len(shows_fetched)}")
     return shows_fetched[:limit]
 
 
+def filter_recently_loaded(conn, table: str, summaries: list, days: int = SKIP_RECENT_DAYS) -> list:
+    """Drop discovered titles that were loaded into table within the last days days"""
+    ids = [summary.get('id') for summary in summaries if summary.get('id')]
+    if days <= 0 or not ids:
+        return summaries
+    
+    placeholders = ','.join('?' * len(ids))
+    recent = {
+        row[0] for row in conn.execute(
+            f"""
+            SELECT tmdb_id FROM {table}
+            WHERE tmdb_id IN ({placeholders}) AND created_at > datetime('now', ?)
+            """,
+            (*ids, f'-{days} days')
+        )
+    }
+    if recent:
+        logger.info(f"Skipping {len(recent)} {table} loaded in the last {days} days")
+    return [summary for summary in summaries if summary.get('id') not in recent]
+
+
 def process_discovered_movies(etl_service: TMDbETLService, conn, movie_summaries: list):
     """Process discovered movies using the ETL service methods"""
+    movie_summaries = filter_recently_loaded(conn, 'movies', movie_summaries)
     logger.info(f"Processing {len(movie_summaries)} discovered movies...")
     
     max_cast = etl_service.config.get('data_limits', {}).get('max_cast', 25)
+    batch_size = etl_service.config.get('database', {}).get('write_batch_size', 50)
+    pending = []
     
-    for summary in movie_summaries:
-        movie_id = summary.get('id')
-        if not movie_id:
-            continue
-        
-        try:
-            etl_service.stats['movies_processed'] += 1
-            
-            # Fetch detailed movie data
-            detail = etl_service._api_get(
-                f'/movie/{movie_id}',
-                append_to_response='credits'
-            )
-            
-            # Validate data quality
-            if not etl_service._validate_movie_data(detail):
-                logger.debug(f"Movie {movie_id} skipped due to quality filters")
-                etl_service.stats['movies_skipped'] += 1
+    # Database writes run on a background thread while the next titles are fetched
+    with etl_service._background_writer(etl_service._write_movie_batch, conn) as submit:
+        for summary in movie_summaries:
+            movie_id = summary.get('id')
+            if not movie_id:
                 continue
             
-            # Transform data
-            movie_data = etl_service._transform_movie_data(detail)
-            
-            # Fetch all person details BEFORE entering transaction
-            credits = detail.get('credits', {}).get('cast', [])
-            person_details_map = {}
-            for cast in credits[:max_cast]:
-                person_details = etl_service._fetch_person_details(cast.get('id'))
-                person_details.update({
-                    'id': cast.get('id'),
-                    'name': cast.get('name'),
-                    'profile_path': cast.get('profile_path'),
-                })
-                person_details_map[cast.get('id')] = person_details
-            
-            # Now do all database operations in a quick transaction
-            with conn:
-                # Upsert movie
-                etl_service._upsert_movie(conn, movie_data)
+            try:
+                etl_service._add_stat('movies_processed')
                 
-                # Link genres
-                etl_service._link_movie_genres(conn, movie_id, detail.get('genres', []))
+                # Fetch detailed movie data
+                detail = etl_service._api_get(
+                    f'/movie/{movie_id}',
+                    append_to_response='credits'
+                )
                 
-                # Process cast
-                for cast in credits[:max_cast]:
-                    person_details = person_details_map.get(cast.get('id'))
-                    if person_details:
-                        etl_service._upsert_person(conn, person_details)
-                        etl_service._attach_movie_cast(conn, movie_id, cast)
-            
-            if etl_service.stats['movies_processed'] % 10 == 0:
-                logger.info(f"Processed {etl_service.stats['movies_processed']} movies...")
+                # Validate data quality
+                if not etl_service._validate_movie_data(detail):
+                    logger.debug(f"Movie {movie_id} skipped due to quality filters")
+                    etl_service._add_stat('movies_skipped')
+                    continue
                 
-        except Exception as e:
-            logger.error(f"Error processing movie {movie_id}: {e}")
-            etl_service.stats['errors'] += 1
+                # Transform data
+                movie_data = etl_service._transform_movie_data(detail)
+                
+                # Fetch all person details concurrently BEFORE entering transaction
+                credits = detail.get('credits', {}).get('cast', [])
+                person_details_map = etl_service._prefetch_people(credits[:max_cast])
+                cast_list = [
+                    cast for cast in credits[:max_cast]
+                    if person_details_map.get(cast.get('id'))
+                ]
+                
+                # Queue for the next batch write
+                pending.append((
+                    movie_data,
+                    detail.get('genres', []),
+                    cast_list,
+                    [person_details_map[cast.get('id')] for cast in cast_list],
+                ))
+                
+                if etl_service.stats['movies_processed'] % 10 == 0:
+                    logger.info(f"Processed {etl_service.stats['movies_processed']} movies...")
+                    
+            except Exception as e:
+                logger.error(f"Error processing movie {movie_id}: {e}")
+                etl_service._add_stat('errors')
+            
+            # Write batch_size titles per transaction; if a batch fails the writer
+            # retries it title by title, so only the failing titles are dropped
+            if len(pending) >= batch_size:
+                submit(pending)
+                pending = []
+        
+        if pending:
+            submit(pending)
 
 
 def process_discovered_shows(etl_service: TMDbETLService, conn, show_summaries: list, episodes_per_season: int = 10):
     """Process discovered TV shows using the ETL service methods"""
+    show_summaries = filter_recently_loaded(conn, 'shows', show_summaries)
     logger.info(f"Processing {len(show_summaries)} discovered TV shows...")
     
     max_cast = etl_service.config.get('data_limits', {}).get('max_cast', 25)
+    batch_size = etl_service.config.get('database', {}).get('write_batch_size', 50)
+    pending = []
     
-    for summary in show_summaries:
-        show_id = summary.get('id')
-        if not show_id:
-            continue
-        
-        try:
-            etl_service.stats['shows_processed'] += 1
-            
-            # Fetch detailed show data
-            detail = etl_service._api_get(
-                f'/tv/{show_id}',
-                append_to_response='aggregate_credits,seasons'
-            )
-            
-            # Validate data quality
-            if not etl_service._validate_show_data(detail):
-                logger.debug(f"Show {show_id} skipped due to quality filters")
-                etl_service.stats['shows_skipped'] += 1
+    # Database writes run on a background thread while the next titles are fetched
+    with etl_service._background_writer(
+        etl_service._write_show_batch, conn, episodes_per_season
+    ) as submit:
+        for summary in show_summaries:
+            show_id = summary.get('id')
+            if not show_id:
                 continue
             
-            # Transform data
-            show_data = etl_service._transform_show_data(detail)
-            
-            # Fetch all person details BEFORE entering transaction
-            credits = detail.get('aggregate_credits', {}).get('cast', [])
-            person_details_map = {}
-            for cast in credits[:max_cast]:
-                person_details = etl_service._fetch_person_details(cast.get('id'))
-                person_details.update({
-                    'id': cast.get('id'),
-                    'name': cast.get('name'),
-                    'profile_path': cast.get('profile_path'),
-                })
-                person_details_map[cast.get('id')] = person_details
-            
-            # Fetch all season details BEFORE entering transaction
-            seasons = detail.get('seasons', [])
-            season_details_map = {}
-            for season in seasons:
-                season_number = season.get('season_number')
-                if season_number in (None, 0):
+            try:
+                etl_service._add_stat('shows_processed')
+                
+                # Fetch detailed show data
+                detail = etl_service._api_get(
+                    f'/tv/{show_id}',
+                    append_to_response='aggregate_credits,seasons'
+                )
+                
+                # Validate data quality
+                if not etl_service._validate_show_data(detail):
+                    logger.debug(f"Show {show_id} skipped due to quality filters")
+                    etl_service._add_stat('shows_skipped')
                     continue
-                try:
-                    season_detail = etl_service._api_get(f'/tv/{show_id}/season/{season_number}')
-                    season_details_map[season_number] = season_detail
-                except Exception as e:
-                    logger.warning(f"Error fetching season {season_number} of show {show_id}: {e}")
-            
-            # Now do all database operations in a quick transaction
-            with conn:
-                # Upsert show
-                etl_service._upsert_show(conn, show_data)
                 
-                # Link genres
-                etl_service._link_show_genres(conn, show_id, detail.get('genres', []))
+                # Transform data
+                show_data = etl_service._transform_show_data(detail)
                 
-                # Process cast
-                for cast in credits[:max_cast]:
-                    person_details = person_details_map.get(cast.get('id'))
-                    if person_details:
-                        etl_service._upsert_person(conn, person_details)
-                        etl_service._attach_show_cast(conn, show_id, cast)
+                # Fetch all person details concurrently BEFORE entering transaction
+                credits = detail.get('aggregate_credits', {}).get('cast', [])
+                person_details_map = etl_service._prefetch_people(credits[:max_cast])
                 
-                # Process seasons and episodes
-                for season in seasons:
-                    season_number = season.get('season_number')
-                    if season_number in (None, 0):
-                        continue
-                    
-                    etl_service._upsert_season(conn, show_id, season)
+                # Fetch all season details BEFORE entering transaction, concurrently
+                seasons = [
+                    season for season in detail.get('seasons', [])
+                    if season.get('season_number') not in (None, 0)  # Skip specials
+                ]
+                futures = {
+                    season['season_number']: etl_service._executor.submit(
+                        etl_service._api_get, f"/tv/{show_id}/season/{season['season_number']}"
+                    )
+                    for season in seasons
+                }
+                season_details_map = {}
+                for season_number, future in futures.items():
+                    try:
+                        season_details_map[season_number] = future.result()
+                    except Exception as e:
+                        logger.warning(f"Error fetching season {season_number} of show {show_id}: {e}")
+                
+                cast_list = [
+                    cast for cast in credits[:max_cast]
+                    if person_details_map.get(cast.get('id'))
+                ]
+                
+                # Queue for the next batch write
+                pending.append((
+                    show_data,
+                    detail.get('genres', []),
+                    cast_list,
+                    [person_details_map[cast.get('id')] for cast in cast_list],
+                    seasons,
+                    season_details_map,
+                ))
+                
+                if etl_service.stats['shows_processed'] % 10 == 0:
+                    logger.info(f"Processed {etl_service.stats['shows_processed']} shows...")
                     
-                    season_detail = season_details_map.get(season_number)
-                    if season_detail:
-                        episodes = season_detail.get('episodes', [])[:episodes_per_season]
-                        for episode in episodes:
-                            etl_service._upsert_episode(conn, show_id, season_number, episode)
+            except Exception as e:
+                logger.error(f"Error processing show {show_id}: {e}")
+                etl_service._add_stat('errors')
             
-            if etl_service.stats['shows_processed'] % 10 == 0:
-                logger.info(f"Processed {etl_service.stats['shows_processed']} shows...")
-                
-        except Exception as e:
-            logger.error(f"Error processing show {show_id}: {e}")
-            etl_service.stats['errors'] += 1
+            # Write batch_size titles per transaction; if a batch fails the writer
+            # retries it title by title, so only the failing titles are dropped
+            if len(pending) >= batch_size:
+                submit(pending)
+                pending = []
+        
+        if pending:
+            submit(pending)
 
 
 def main():
@@ -49,10 +49,8 @@ def test_new_releases_sorting():
                COALESCE(m.release_date, CAST(m.release_year AS TEXT)) AS release_sort,
                COALESCE(m.release_date, CASE WHEN m.release_year IS NOT NULL THEN CAST(m.release_year AS TEXT) ELSE NULL END) AS release_date
         FROM movies m
-        INNER JOIN movie_genres mg ON mg.movie_id = m.movie_id
-        INNER JOIN genres g ON g.genre_id = mg.genre_id
         WHERE m.release_year IS NOT NULL AND m.overview IS NOT NULL AND m.overview != ''
-        GROUP BY m.movie_id
+          AND EXISTS (SELECT 1 FROM movie_genres mg WHERE mg.movie_id = m.movie_id)
         ORDER BY 
             (COALESCE(m.release_date, CAST(m.release_year AS TEXT)) IS NULL),
             CASE 
@@ -98,10 +96,8 @@ def test_new_releases_sorting():
                    COALESCE(m.release_date, CAST(m.release_year AS TEXT)) AS release_sort,
                    COALESCE(m.release_date, CASE WHEN m.release_year IS NOT NULL THEN CAST(m.release_year AS TEXT) ELSE NULL END) AS release_date
             FROM movies m
-            INNER JOIN movie_genres mg ON mg.movie_id = m.movie_id
-            INNER JOIN genres g ON g.genre_id = mg.genre_id
             WHERE m.release_year IS NOT NULL AND m.overview IS NOT NULL AND m.overview != ''
-            GROUP BY m.movie_id
+              AND EXISTS (SELECT 1 FROM movie_genres mg WHERE mg.movie_id = m.movie_id)
             UNION ALL
             SELECT 'tv' AS media_type,
                    s.show_id AS item_id,
@@ -115,10 +111,8 @@ def test_new_releases_sorting():
                    END AS release_sort,
                    s.first_air_date AS release_date
             FROM shows s
-            INNER JOIN show_genres sg ON sg.show_id = s.show_id
-            INNER JOIN genres g ON g.genre_id = sg.genre_id
             WHERE s.first_air_date IS NOT NULL AND s.overview IS NOT NULL AND s.overview != ''
-            GROUP BY s.show_id
+              AND EXISTS (SELECT 1 FROM show_genres sg WHERE sg.show_id = s.show_id)
         )
         ORDER BY (release_sort IS NULL), release_sort DESC, (score IS NULL), score DESC, popularity DESC, title
         LIMIT 12
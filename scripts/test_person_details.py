@@ -19,6 +19,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 
+try:
+    import requests
+except ImportError:  # Only needed for the API endpoint check
+    requests = None
+
 load_dotenv()
 
 DB_PATH = os.getenv("DATABASE_PATH", os.path.join(os.path.dirname(__file__), "..", "movie_tracker.db"))
@@ -64,23 +69,16 @@ def check_sample_data():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     
-    # Count total people
-    total = conn.execute("SELECT COUNT(*) as count FROM people").fetchone()["count"]
+    # Count total people and people with extended data in one scan
+    # (COUNT(column) skips NULLs)
+    total, with_birthday, with_biography, with_imdb = conn.execute(
+        """
+        SELECT COUNT(*), COUNT(birthday), COUNT(biography), COUNT(imdb_id)
+        FROM people
+        """
+    ).fetchone()
     print(f"\nTotal people in database: {total}")
     
-    # Count people with extended data
-    with_birthday = conn.execute(
-        "SELECT COUNT(*) as count FROM people WHERE birthday IS NOT NULL"
-    ).fetchone()["count"]
-    
-    with_biography = conn.execute(
-        "SELECT COUNT(*) as count FROM people WHERE biography IS NOT NULL"
-    ).fetchone()["count"]
-    
-    with_imdb = conn.execute(
-        "SELECT COUNT(*) as count FROM people WHERE imdb_id IS NOT NULL"
-    ).fetchone()["count"]
-    
     print(f"People with birthday: {with_birthday} ({with_birthday/total*100 if total > 0 else 0:.1f}%)")
     print(f"People with biography: {with_biography} ({with_biography/total*100 if total > 0 else 0:.1f}%)")
     print(f"People with IMDB ID: {with_imdb} ({with_imdb/total*100 if total > 0 else 0:.1f}%)")
@@ -118,11 +116,14 @@ def test_api_endpoint():
     print("TESTING API ENDPOINT")
     print("=" * 60)
     
+    if requests is None:
+        print("\n[WARN] 'requests' library not installed.")
+        print("   Install with: pip install requests")
+        return
+    
     try:
-        import requests
-        
-        # Try to reach the backend
-        response = requests.get("http://localhost:5000/api/people/1", timeout=5)
+        # Try to reach the backend; a short connect timeout fails fast when it isn't running
+        response = requests.get("http://localhost:5000/api/people/1", timeout=(1, 4))
         
         if response.status_code == 200:
             data = response.json()
@@ -139,9 +140,6 @@ def test_api_endpoint():
     except requests.exceptions.ConnectionError:
         print("\n[WARN] Backend server not running.")
         print("   Start it with: python run_server.py")
-    except ImportError:
-        print("\n[WARN] 'requests' library not installed.")
-        print("   Install with: pip install requests")
     except Exception as e:
         print(f"\n[FAIL] Error testing API: {e}")
 
@@ -14,7 +14,8 @@ DB_PATH = project_root / "movie_tracker.db"
 
 def test_release_date_filter():
     """Test if release date filter/sort works correctly"""
-    conn = sqlite3.connect(str(DB_PATH))
+    # Diagnostics only run SELECTs, so open the database read-only
+    conn = sqlite3.connect(f"{DB_PATH.resolve().as_uri()}?mode=ro", uri=True)
     conn.row_factory = sqlite3.Row
     
     print("=" * 80)
@@ -35,6 +36,7 @@ def test_release_date_filter():
         fnaf2_year = fnaf2['release_year']
     else:
         print("   ERROR: 'Five Nights at Freddy's 2' not found!")
+        conn.close()
         return
     
     # Check if it has overview (required for filtering)
@@ -44,30 +46,37 @@ def test_release_date_filter():
     # Find all movies with same release year
     print(f"\n2. Movies with release_year = {fnaf2_year}:")
     print("-" * 80)
+    same_year_count = conn.execute(
+        "SELECT COUNT(*) FROM movies WHERE release_year = ?", (fnaf2_year,)
+    ).fetchone()[0]
+    print(f"   Found {same_year_count} movies with release_year={fnaf2_year}")
+    # Only the first 10 are printed, so only 10 are fetched; rows stream off the cursor
     cursor = conn.execute("""
         SELECT movie_id, title, release_year, 
                CASE WHEN overview IS NOT NULL AND overview != '' THEN 'Yes' ELSE 'No' END as has_overview
         FROM movies 
         WHERE release_year = ?
         ORDER BY title
-        LIMIT 20
+        LIMIT 10
     """, (fnaf2_year,))
-    same_year_movies = cursor.fetchall()
-    print(f"   Found {len(same_year_movies)} movies with release_year={fnaf2_year}")
-    for movie in same_year_movies[:10]:
+    for movie in cursor:
         print(f"   - {movie['title']} (ID: {movie['movie_id']}, Has Overview: {movie['has_overview']})")
     
     # Test the actual query used by the API (with genre join requirement)
     print(f"\n3. Testing API query (with genre requirement):")
     print("-" * 80)
     cursor = conn.execute("""
-        SELECT DISTINCT m.movie_id, m.title, m.release_year
+        SELECT m.movie_id, m.title, m.release_year
         FROM movies m
-        INNER JOIN movie_genres mg ON m.movie_id = mg.movie_id
-        INNER JOIN genres g ON g.genre_id = mg.genre_id
         WHERE m.overview IS NOT NULL 
           AND m.overview != ''
           AND m.release_year = ?
+          AND EXISTS (
+              SELECT 1
+              FROM movie_genres mg
+              INNER JOIN genres g ON g.genre_id = mg.genre_id
+              WHERE mg.movie_id = m.movie_id
+          )
         ORDER BY m.release_year DESC, m.title
         LIMIT 20
     """, (fnaf2_year,))
@@ -110,18 +119,21 @@ def test_release_date_filter():
     print(f"\n4. Testing sort by release_date (DESC - newest first):")
     print("-" * 80)
     cursor = conn.execute("""
-        SELECT DISTINCT m.movie_id, m.title, m.release_year
+        SELECT m.movie_id, m.title, m.release_year
         FROM movies m
-        INNER JOIN movie_genres mg ON m.movie_id = mg.movie_id
-        INNER JOIN genres g ON g.genre_id = mg.genre_id
         WHERE m.overview IS NOT NULL 
           AND m.overview != ''
-        ORDER BY (m.release_year IS NULL), m.release_year DESC, m.title
+          AND EXISTS (
+              SELECT 1
+              FROM movie_genres mg
+              INNER JOIN genres g ON g.genre_id = mg.genre_id
+              WHERE mg.movie_id = m.movie_id
+          )
+        ORDER BY m.release_year DESC, m.title
         LIMIT 10
     """)
-    sorted_results = cursor.fetchall()
     print("   Top 10 movies when sorted by release_date DESC:")
-    for i, movie in enumerate(sorted_results, 1):
+    for i, movie in enumerate(cursor, 1):
         marker = " <-- FNAF2" if movie['movie_id'] == fnaf2['movie_id'] else ""
         print(f"   {i}. {movie['title']} ({movie['release_year']}){marker}")
     
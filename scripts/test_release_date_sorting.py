@@ -11,7 +11,8 @@ DB_PATH = project_root / "movie_tracker.db"
 
 def test_release_date_sorting():
     """Test if release date sorting works correctly"""
-    conn = sqlite3.connect(str(DB_PATH))
+    # Diagnostics only run SELECTs, so open the database read-only
+    conn = sqlite3.connect(f"{DB_PATH.resolve().as_uri()}?mode=ro", uri=True)
     conn.row_factory = sqlite3.Row
     
     print("=" * 80)
@@ -35,15 +36,20 @@ def test_release_date_sorting():
         fnaf2_year = fnaf2['release_year']
     else:
         print("   ERROR: 'Five Nights at Freddy's 2' not found!")
+        conn.close()
         return
     
     # Check how many movies have release_date populated
     print(f"\n2. Database Status:")
     print("-" * 80)
-    cursor = conn.execute("SELECT COUNT(*) as cnt FROM movies WHERE release_date IS NOT NULL")
-    with_date = cursor.fetchone()['cnt']
-    cursor = conn.execute("SELECT COUNT(*) as cnt FROM movies WHERE release_year = 2025")
-    total_2025 = cursor.fetchone()['cnt']
+    # Both counts in one pass over movies; COUNT(...) stays 0 on an empty table
+    cursor = conn.execute("""
+        SELECT COUNT(release_date) AS with_date,
+               COUNT(CASE WHEN release_year = 2025 THEN 1 END) AS total_2025
+        FROM movies
+    """)
+    status = cursor.fetchone()
+    with_date, total_2025 = status['with_date'], status['total_2025']
     print(f"   Movies with release_date populated: {with_date}")
     print(f"   Movies with release_year = 2025: {total_2025}")
     
@@ -56,19 +62,25 @@ def test_release_date_sorting():
     print(f"\n3. Testing API sorting logic (release_date DESC):")
     print("-" * 80)
     
-    # Simulate the API query with COALESCE logic
+    # Index-friendly stand-in for the API's ORDER BY (release_sort IS NULL),
+    # release_sort DESC: with release_year = 2025 every release_sort is either
+    # '2025-MM-DD' or the bare '2025', which sorts below any full date, so
+    # release_date DESC NULLS LAST gives the same order. This only holds under
+    # the single-year filter, and ties break on title rather than the API's score
     cursor = conn.execute("""
-        SELECT DISTINCT m.movie_id, m.title, m.release_year, m.release_date,
+        SELECT m.movie_id, m.title, m.release_year, m.release_date,
                COALESCE(m.release_date, CAST(m.release_year AS TEXT)) AS release_sort
         FROM movies m
-        INNER JOIN movie_genres mg ON m.movie_id = mg.movie_id
-        INNER JOIN genres g ON g.genre_id = mg.genre_id
         WHERE m.overview IS NOT NULL 
           AND m.overview != ''
           AND m.release_year = 2025
-        ORDER BY (COALESCE(m.release_date, CAST(m.release_year AS TEXT)) IS NULL), 
-                 COALESCE(m.release_date, CAST(m.release_year AS TEXT)) DESC, 
-                 m.title
+          AND EXISTS (
+              SELECT 1
+              FROM movie_genres mg
+              INNER JOIN genres g ON g.genre_id = mg.genre_id
+              WHERE mg.movie_id = m.movie_id
+          )
+        ORDER BY m.release_date DESC NULLS LAST, m.release_year DESC, m.title
         LIMIT 30
     """)
     sorted_results = cursor.fetchall()
@@ -88,37 +100,49 @@ def test_release_date_sorting():
     else:
         print(f"\n   [WARNING] 'Five Nights at Freddy's 2' not in top 30 results")
         print("   Checking if it's in the full list...")
+        # Rank the filtered set once, in the same order as step 3, and read FNAF2's row
         cursor = conn.execute("""
-            SELECT COUNT(*) as pos FROM (
-                SELECT DISTINCT m.movie_id
+            WITH ranked AS (
+                SELECT m.movie_id,
+                       ROW_NUMBER() OVER (
+                           ORDER BY m.release_date DESC NULLS LAST, m.release_year DESC, m.title
+                       ) AS pos
                 FROM movies m
-                INNER JOIN movie_genres mg ON m.movie_id = mg.movie_id
-                INNER JOIN genres g ON g.genre_id = mg.genre_id
                 WHERE m.overview IS NOT NULL 
                   AND m.overview != ''
                   AND m.release_year = 2025
-                  AND (COALESCE(m.release_date, CAST(m.release_year AS TEXT)) IS NULL OR
-                       COALESCE(m.release_date, CAST(m.release_year AS TEXT)) > 
-                       COALESCE((SELECT release_date FROM movies WHERE movie_id = ?), 
-                                CAST((SELECT release_year FROM movies WHERE movie_id = ?) AS TEXT)))
+                  AND EXISTS (
+                      SELECT 1
+                      FROM movie_genres mg
+                      INNER JOIN genres g ON g.genre_id = mg.genre_id
+                      WHERE mg.movie_id = m.movie_id
+                  )
             )
-        """, (fnaf2_id, fnaf2_id))
-        position = cursor.fetchone()['pos'] + 1
-        print(f"   Estimated position: {position} out of {total_2025}")
+            SELECT pos FROM ranked WHERE movie_id = ?
+        """, (fnaf2_id,))
+        ranked = cursor.fetchone()
+        if ranked:
+            print(f"   Estimated position: {ranked['pos']} out of {total_2025}")
+        else:
+            print("   Not in the filtered list (missing overview or genres)")
     
     # Test with actual release dates if available
     if with_date > 0:
         print(f"\n4. Testing with actual release dates:")
         print("-" * 80)
         cursor = conn.execute("""
-            SELECT DISTINCT m.movie_id, m.title, m.release_date
+            SELECT m.movie_id, m.title, m.release_date
             FROM movies m
-            INNER JOIN movie_genres mg ON m.movie_id = mg.movie_id
-            INNER JOIN genres g ON g.genre_id = mg.genre_id
             WHERE m.overview IS NOT NULL 
               AND m.overview != ''
               AND m.release_date IS NOT NULL
               AND m.release_year = 2025
+              AND EXISTS (
+                  SELECT 1
+                  FROM movie_genres mg
+                  INNER JOIN genres g ON g.genre_id = mg.genre_id
+                  WHERE mg.movie_id = m.movie_id
+              )
             ORDER BY m.release_date DESC, m.title
             LIMIT 20
         """)
@@ -8,15 +8,20 @@ Example:
 from __future__ import annotations
 
 import argparse
+import math
 import os
 import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE = "https://api.themoviedb.org/3"
+DETAIL_WORKERS = 8
 DB_PATH = os.getenv("DATABASE_PATH", os.path.join(os.path.dirname(__file__), "..", "movie_tracker.db"))
 
 
@@ -32,7 +37,16 @@ def ensure_api_key() -> str:
 def connect_db() -> sqlite3.Connection:
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    # WAL + NORMAL sync: no fsync per committed title; a 64 MB cache and mmap
+    # keep the ON CONFLICT index probes in memory
+    conn.executescript(
+        "PRAGMA journal_mode = WAL;"
+        "PRAGMA synchronous = NORMAL;"
+        "PRAGMA temp_store = MEMORY;"
+        "PRAGMA cache_size = -65536;"
+        "PRAGMA mmap_size = 268435456;"
+        "PRAGMA foreign_keys = ON;"
+    )
     ensure_extended_columns(conn)
     return conn
 
@@ -40,8 +54,9 @@ def connect_db() -> sqlite3.Connection:
 def ensure_extended_columns(conn: sqlite3.Connection) -> None:
     """Add newer optional columns if they are missing."""
     def has_column(table: str, column: str) -> bool:
-        rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-        return any(row["name"] == column for row in rows)
+        return conn.execute(
+            "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1", (table, column)
+        ).fetchone() is not None
 
     with conn:
         if not has_column("movies", "backdrop_path"):
@@ -73,19 +88,44 @@ def ensure_extended_columns(conn: sqlite3.Connection) -> None:
         if not has_column("people", "facebook_id"):
             conn.execute("ALTER TABLE people ADD COLUMN facebook_id TEXT")
 
+        # Sort paths used by the catalog and the release-date diagnostics
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_movies_release_date ON movies(release_date DESC, title)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_movies_year_title ON movies(release_year DESC, title) "
+            "WHERE overview IS NOT NULL AND overview != ''"
+        )
+
 
 class TMDbClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self._base_url = API_BASE
+        self._base_params = {"api_key": api_key}
         self.session = requests.Session()
+        # One keep-alive connection per get_many worker; transient TMDb errors and
+        # 429s are retried by urllib3 (honouring Retry-After) instead of failing the run
+        retries = Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(
+            pool_connections=DETAIL_WORKERS, pool_maxsize=DETAIL_WORKERS, max_retries=retries
+        )
+        self.session.mount("https://", adapter)
         self._person_cache = {}  # Cache to avoid refetching person details
 
     def get(self, path: str, **params):
-        params["api_key"] = self.api_key
-        url = f"{API_BASE}{path}"
-        resp = self.session.get(url, params=params, timeout=25)
+        req_params = {**self._base_params, **params} if params else self._base_params
+        resp = self.session.get(self._base_url + path, params=req_params, timeout=25)
         resp.raise_for_status()
         return resp.json()
+
+    def get_many(self, calls: Iterable[tuple[str, dict]]) -> list[dict]:
+        """GET several (path, params) pairs concurrently; results keep request order."""
+        calls = list(calls)
+        if not calls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(DETAIL_WORKERS, len(calls))) as pool:
+            return list(pool.map(lambda call: self.get(call[0], **call[1]), calls))
     
     def fetch_person_details(self, tmdb_person_id: int) -> dict:
         """Fetch full person details including biography and external IDs."""
@@ -114,7 +154,8 @@ def upsert_genres(conn: sqlite3.Connection, payload: Iterable[dict]):
             )
 
 
-def upsert_movie(conn: sqlite3.Connection, data: dict):
+def upsert_movie(conn: sqlite3.Connection, data: dict) -> int:
+    """Insert or update a movie and return its movie_id."""
     release_year = None
     release_date_full = data.get("release_date")
     if release_date_full and len(release_date_full) >= 4:
@@ -137,7 +178,7 @@ def upsert_movie(conn: sqlite3.Connection, data: dict):
         data.get("vote_average"),
         data.get("popularity"),
     )
-    conn.execute(
+    return conn.execute(
         """
         INSERT INTO movies (
             tmdb_id, title, release_year, release_date, runtime_min, overview, poster_path,
@@ -154,12 +195,14 @@ def upsert_movie(conn: sqlite3.Connection, data: dict):
             original_language = excluded.original_language,
             tmdb_vote_avg = excluded.tmdb_vote_avg,
             popularity = excluded.popularity
+        RETURNING movie_id
         """,
         params,
-    )
+    ).fetchone()[0]
 
 
-def upsert_show(conn: sqlite3.Connection, data: dict):
+def upsert_show(conn: sqlite3.Connection, data: dict) -> int:
+    """Insert or update a show and return its show_id."""
     params = (
         data.get("id"),
         data.get("name"),
@@ -172,7 +215,7 @@ def upsert_show(conn: sqlite3.Connection, data: dict):
         data.get("vote_average"),
         data.get("popularity"),
     )
-    conn.execute(
+    return conn.execute(
         """
         INSERT INTO shows (
             tmdb_id, title, first_air_date, last_air_date, overview, poster_path,
@@ -188,17 +231,34 @@ def upsert_show(conn: sqlite3.Connection, data: dict):
             original_language = excluded.original_language,
             tmdb_vote_avg = excluded.tmdb_vote_avg,
             popularity = excluded.popularity
+        RETURNING show_id
         """,
         params,
-    )
+    ).fetchone()[0]
 
 
-def upsert_person(conn: sqlite3.Connection, person_data: dict):
-    """Upsert person with extended details."""
+def person_params(person_data: dict) -> tuple:
+    """Build the people row parameters for a person."""
     # Extract external IDs if present
     external_ids = person_data.get("external_ids", {})
-    
-    conn.execute(
+    return (
+        person_data.get("id"),
+        person_data.get("name"),
+        person_data.get("profile_path"),
+        person_data.get("birthday"),
+        person_data.get("deathday"),
+        person_data.get("place_of_birth"),
+        person_data.get("biography"),
+        external_ids.get("imdb_id"),
+        external_ids.get("instagram_id"),
+        external_ids.get("twitter_id"),
+        external_ids.get("facebook_id"),
+    )
+
+
+def upsert_people(conn: sqlite3.Connection, people: Iterable[dict]):
+    """Upsert a batch of people with extended details."""
+    conn.executemany(
         """
         INSERT INTO people (
             tmdb_person_id, name, profile_path, birthday, deathday, 
@@ -217,28 +277,16 @@ def upsert_person(conn: sqlite3.Connection, person_data: dict):
             twitter_id = COALESCE(excluded.twitter_id, twitter_id),
             facebook_id = COALESCE(excluded.facebook_id, facebook_id)
         """,
-        (
-            person_data.get("id"),
-            person_data.get("name"),
-            person_data.get("profile_path"),
-            person_data.get("birthday"),
-            person_data.get("deathday"),
-            person_data.get("place_of_birth"),
-            person_data.get("biography"),
-            external_ids.get("imdb_id"),
-            external_ids.get("instagram_id"),
-            external_ids.get("twitter_id"),
-            external_ids.get("facebook_id"),
-        ),
+        [person_params(person_data) for person_data in people],
     )
 
 
-def attach_movie_cast(conn: sqlite3.Connection, movie_tmdb_id: int, cast: dict):
-    conn.execute(
+def attach_movie_cast(conn: sqlite3.Connection, movie_id: int, cast_list: Iterable[dict]):
+    conn.executemany(
         """
         INSERT INTO movie_cast (movie_id, person_id, character, cast_order)
         VALUES (
-            (SELECT movie_id FROM movies WHERE tmdb_id = ?),
+            ?,
             (SELECT person_id FROM people WHERE tmdb_person_id = ?),
             ?, ?
         )
@@ -246,21 +294,24 @@ def attach_movie_cast(conn: sqlite3.Connection, movie_tmdb_id: int, cast: dict):
             character = excluded.character,
             cast_order = excluded.cast_order
         """,
-        (
-            movie_tmdb_id,
-            cast.get("id"),
-            cast.get("character"),
-            cast.get("order"),
-        ),
+        [
+            (
+                movie_id,
+                cast.get("id"),
+                cast.get("character"),
+                cast.get("order"),
+            )
+            for cast in cast_list
+        ],
     )
 
 
-def attach_show_cast(conn: sqlite3.Connection, show_tmdb_id: int, cast: dict):
-    conn.execute(
+def attach_show_cast(conn: sqlite3.Connection, show_id: int, cast_list: Iterable[dict]):
+    conn.executemany(
         """
         INSERT INTO show_cast (show_id, person_id, character, cast_order)
         VALUES (
-            (SELECT show_id FROM shows WHERE tmdb_id = ?),
+            ?,
             (SELECT person_id FROM people WHERE tmdb_person_id = ?),
             ?, ?
         )
@@ -268,96 +319,101 @@ def attach_show_cast(conn: sqlite3.Connection, show_tmdb_id: int, cast: dict):
             character = excluded.character,
             cast_order = excluded.cast_order
         """,
-        (
-            show_tmdb_id,
-            cast.get("id"),
-            cast.get("character") or (cast.get("roles") or [{}])[0].get("character"),
-            cast.get("order") if cast.get("order") is not None else cast.get("total_episode_count"),
-        ),
+        [
+            (
+                show_id,
+                cast.get("id"),
+                cast.get("character") or (cast.get("roles") or [{}])[0].get("character"),
+                cast.get("order") if cast.get("order") is not None else cast.get("total_episode_count"),
+            )
+            for cast in cast_list
+        ],
     )
 
 
-def link_movie_genres(conn: sqlite3.Connection, movie_tmdb_id: int, genres: Iterable[dict]):
-    for genre in genres or []:
-        conn.execute(
-            """
-            INSERT OR IGNORE INTO movie_genres (movie_id, genre_id)
-            SELECT m.movie_id, g.genre_id
-            FROM movies m, genres g
-            WHERE m.tmdb_id = ? AND g.tmdb_genre_id = ?
-            """,
-            (movie_tmdb_id, genre.get("id")),
-        )
+def load_genre_map(conn: sqlite3.Connection) -> dict[int, int]:
+    """Map TMDb genre ids to genres.genre_id; read once after upsert_genres."""
+    return {
+        row["tmdb_genre_id"]: row["genre_id"]
+        for row in conn.execute("SELECT tmdb_genre_id, genre_id FROM genres")
+    }
 
 
-def link_show_genres(conn: sqlite3.Connection, show_tmdb_id: int, genres: Iterable[dict]):
-    for genre in genres or []:
-        conn.execute(
-            """
-            INSERT OR IGNORE INTO show_genres (show_id, genre_id)
-            SELECT s.show_id, g.genre_id
-            FROM shows s, genres g
-            WHERE s.tmdb_id = ? AND g.tmdb_genre_id = ?
-            """,
-            (show_tmdb_id, genre.get("id")),
-        )
+def link_movie_genres(conn: sqlite3.Connection, movie_id: int, genres: Iterable[dict],
+                      genre_map: dict[int, int]):
+    conn.executemany(
+        "INSERT OR IGNORE INTO movie_genres (movie_id, genre_id) VALUES (?, ?)",
+        [(movie_id, genre_map[g.get("id")]) for g in genres or [] if g.get("id") in genre_map],
+    )
+
+
+def link_show_genres(conn: sqlite3.Connection, show_id: int, genres: Iterable[dict],
+                     genre_map: dict[int, int]):
+    conn.executemany(
+        "INSERT OR IGNORE INTO show_genres (show_id, genre_id) VALUES (?, ?)",
+        [(show_id, genre_map[g.get("id")]) for g in genres or [] if g.get("id") in genre_map],
+    )
 
 
-def upsert_season(conn: sqlite3.Connection, show_tmdb_id: int, season: dict):
-    conn.execute(
+def upsert_season(conn: sqlite3.Connection, show_id: int, season: dict) -> int:
+    """Insert or update a season and return its season_id."""
+    return conn.execute(
         """
         INSERT INTO seasons (show_id, season_number, title, air_date)
-        VALUES (
-            (SELECT show_id FROM shows WHERE tmdb_id = ?),
-            ?, ?, ?
-        )
+        VALUES (?, ?, ?, ?)
         ON CONFLICT(show_id, season_number) DO UPDATE SET
             title = excluded.title,
             air_date = excluded.air_date
+        RETURNING season_id
         """,
         (
-            show_tmdb_id,
+            show_id,
             season.get("season_number"),
             season.get("name"),
             season.get("air_date"),
         ),
-    )
+    ).fetchone()[0]
 
 
-def upsert_episode(conn: sqlite3.Connection, show_tmdb_id: int, season_number: int, episode: dict):
-    conn.execute(
+def upsert_episodes(conn: sqlite3.Connection, season_id: int, episodes: Iterable[dict]):
+    conn.executemany(
         """
         INSERT INTO episodes (season_id, episode_number, title, air_date, runtime_min)
-        VALUES (
-            (
-                SELECT season_id
-                FROM seasons
-                WHERE show_id = (SELECT show_id FROM shows WHERE tmdb_id = ?)
-                  AND season_number = ?
-            ),
-            ?, ?, ?, ?
-        )
+        VALUES (?, ?, ?, ?, ?)
         ON CONFLICT(season_id, episode_number) DO UPDATE SET
             title = excluded.title,
             air_date = excluded.air_date,
             runtime_min = excluded.runtime_min
         """,
-        (
-            show_tmdb_id,
-            season_number,
-            episode.get("episode_number"),
-            episode.get("name"),
-            episode.get("air_date"),
-            episode.get("runtime"),
-        ),
+        [
+            (
+                season_id,
+                episode.get("episode_number"),
+                episode.get("name"),
+                episode.get("air_date"),
+                episode.get("runtime"),
+            )
+            for episode in episodes
+        ],
     )
 
 
 def iter_popular(client: TMDbClient, path: str, total: int):
+    if total <= 0:
+        return
+    # Page 1 gives the page size and page count; the remaining pages needed to
+    # reach `total` are then fetched together
+    first = client.get(path, page=1)
+    pages = [first]
+    page_size = len(first.get("results") or [])
+    if 0 < page_size < total:
+        last_page = math.ceil(total / page_size)
+        if first.get("total_pages"):
+            last_page = min(last_page, first["total_pages"])
+        pages += client.get_many((path, {"page": page}) for page in range(2, last_page + 1))
+
     collected = 0
-    page = 1
-    while collected < total:
-        data = client.get(path, page=page)
+    for data in pages:
         results = data.get("results") or []
         if not results:
             break
@@ -365,20 +421,22 @@ def iter_popular(client: TMDbClient, path: str, total: int):
             yield item
             collected += 1
             if collected >= total:
-                break
-        page += 1
+                return
 
 
-def process_movies(conn: sqlite3.Connection, client: TMDbClient, limit: int):
-    for summary in iter_popular(client, "/movie/popular", limit):
-        movie_id = summary.get("id")
-        if not movie_id:
-            continue
-        detail = client.get(f"/movie/{movie_id}", append_to_response="credits")
+def process_movies(conn: sqlite3.Connection, client: TMDbClient, limit: int,
+                   genre_map: dict[int, int]):
+    # Detail GETs run concurrently; the SQLite writes below stay on this thread
+    movie_ids = [s.get("id") for s in iter_popular(client, "/movie/popular", limit) if s.get("id")]
+    details = client.get_many(
+        (f"/movie/{movie_id}", {"append_to_response": "credits"}) for movie_id in movie_ids
+    )
+    for detail in details:
         with conn:
-            upsert_movie(conn, detail)
-            link_movie_genres(conn, detail.get("id"), detail.get("genres"))
+            movie_pk = upsert_movie(conn, detail)
+            link_movie_genres(conn, movie_pk, detail.get("genres"), genre_map)
             credits = detail.get("credits", {}).get("cast", []) or []
+            people = []
             for cast in credits[:25]:
                 # Fetch full person details from TMDb
                 person_details = client.fetch_person_details(cast.get("id"))
@@ -388,23 +446,31 @@ def process_movies(conn: sqlite3.Connection, client: TMDbClient, limit: int):
                     "name": cast.get("name"),
                     "profile_path": cast.get("profile_path"),
                 })
-                upsert_person(conn, person_details)
-                attach_movie_cast(conn, detail["id"], cast)
-
-
-def process_shows(conn: sqlite3.Connection, client: TMDbClient, limit: int, episodes_per_season: int):
-    for summary in iter_popular(client, "/tv/popular", limit):
-        show_id = summary.get("id")
-        if not show_id:
-            continue
-        detail = client.get(
-            f"/tv/{show_id}",
-            append_to_response="aggregate_credits,seasons",
+                people.append(person_details)
+            upsert_people(conn, people)
+            attach_movie_cast(conn, movie_pk, credits[:25])
+
+
+def process_shows(conn: sqlite3.Connection, client: TMDbClient, limit: int, episodes_per_season: int,
+                  genre_map: dict[int, int]):
+    show_ids = [s.get("id") for s in iter_popular(client, "/tv/popular", limit) if s.get("id")]
+    details = client.get_many(
+        (f"/tv/{show_id}", {"append_to_response": "aggregate_credits,seasons"}) for show_id in show_ids
+    )
+    for show_id, detail in zip(show_ids, details):
+        # Skip specials; the season fan-out is fetched before the write transaction opens
+        seasons = [
+            season for season in detail.get("seasons") or []
+            if season.get("season_number") not in (None, 0)
+        ]
+        season_details = client.get_many(
+            (f"/tv/{show_id}/season/{season['season_number']}", {}) for season in seasons
         )
         with conn:
-            upsert_show(conn, detail)
-            link_show_genres(conn, detail.get("id"), detail.get("genres"))
+            show_pk = upsert_show(conn, detail)
+            link_show_genres(conn, show_pk, detail.get("genres"), genre_map)
             credits = detail.get("aggregate_credits", {}).get("cast", []) or []
+            people = []
             for cast in credits[:25]:
                 # Fetch full person details from TMDb
                 person_details = client.fetch_person_details(cast.get("id"))
@@ -414,18 +480,15 @@ def process_shows(conn: sqlite3.Connection, client: TMDbClient, limit: int, epis
                     "name": cast.get("name"),
                     "profile_path": cast.get("profile_path"),
                 })
-                upsert_person(conn, person_details)
-                attach_show_cast(conn, detail["id"], cast)
+                people.append(person_details)
+            upsert_people(conn, people)
+            attach_show_cast(conn, show_pk, credits[:25])
 
-            seasons = detail.get("seasons") or []
-            for season in seasons:
-                season_number = season.get("season_number")
-                if season_number in (None, 0):
-                    continue  # Skip specials
-                upsert_season(conn, detail["id"], season)
-                season_detail = client.get(f"/tv/{show_id}/season/{season_number}")
-                for episode in (season_detail.get("episodes") or [])[:episodes_per_season]:
-                    upsert_episode(conn, detail["id"], season_number, episode)
+            for season, season_detail in zip(seasons, season_details):
+                season_pk = upsert_season(conn, show_pk, season)
+                upsert_episodes(
+                    conn, season_pk, (season_detail.get("episodes") or [])[:episodes_per_season]
+                )
 
 
 def main():
@@ -442,12 +505,13 @@ def main():
     print("Fetching genre lists...")
     upsert_genres(conn, client.get("/genre/movie/list").get("genres", []))
     upsert_genres(conn, client.get("/genre/tv/list").get("genres", []))
+    genre_map = load_genre_map(conn)
 
     print(f"Ingesting {args.movies} movies...")
-    process_movies(conn, client, args.movies)
+    process_movies(conn, client, args.movies, genre_map)
 
     print(f"Ingesting {args.shows} shows...")
-    process_shows(conn, client, args.shows, args.episodes_per_season)
+    process_shows(conn, client, args.shows, args.episodes_per_season, genre_map)
 
     conn.close()
     print("ETL complete.")
@@ -14,73 +14,81 @@ from etl.monitoring import ETLMonitor, generate_report
 def main():
     """Display ETL metrics"""
     monitor = ETLMonitor()
+    # The metrics block is collected and written to stdout in one call
+    lines = []
     
-    print("\n" + "=" * 80)
-    print("TMDb ETL Pipeline Metrics")
-    print("=" * 80 + "\n")
+    lines.append("\n" + "=" * 80)
+    lines.append("TMDb ETL Pipeline Metrics")
+    lines.append("=" * 80 + "\n")
     
     # Recent runs
-    print("📊 Recent ETL Runs (Last 10)")
-    print("-" * 80)
+    lines.append("📊 Recent ETL Runs (Last 10)")
+    lines.append("-" * 80)
     recent = monitor.get_recent_runs(10)
     
     if not recent:
-        print("No runs recorded yet.\n")
+        lines.append("No runs recorded yet.\n")
     else:
         for run in recent:
             status_icon = "✅" if run['status'] == 'success' else "❌"
-            print(f"{status_icon} Run #{run['run_id']}")
-            print(f"   Started: {run['start_time'][:19]}")
-            print(f"   Duration: {run['duration_seconds']:.1f}s")
-            print(f"   Status: {run['status'].upper()}")
-            print(f"   Movies: {run['movies_processed']} processed, "
-                  f"{run['movies_inserted']} inserted, "
-                  f"{run['movies_updated']} updated")
-            print(f"   Shows: {run['shows_processed']} processed, "
-                  f"{run['shows_inserted']} inserted, "
-                  f"{run['shows_updated']} updated")
-            print(f"   API Calls: {run['api_calls']}")
+            lines.append(
+                f"{status_icon} Run #{run['run_id']}\n"
+                f"   Started: {run['start_time'][:19]}\n"
+                f"   Duration: {run['duration_seconds']:.1f}s\n"
+                f"   Status: {run['status'].upper()}\n"
+                f"   Movies: {run['movies_processed']} processed, "
+                f"{run['movies_inserted']} inserted, "
+                f"{run['movies_updated']} updated\n"
+                f"   Shows: {run['shows_processed']} processed, "
+                f"{run['shows_inserted']} inserted, "
+                f"{run['shows_updated']} updated\n"
+                f"   API Calls: {run['api_calls']}"
+            )
             if run['errors'] > 0:
-                print(f"   ⚠️  Errors: {run['errors']}")
-            print()
+                lines.append(f"   ⚠️  Errors: {run['errors']}")
+            lines.append("")
     
     # 7-day statistics
-    print("📈 7-Day Statistics")
-    print("-" * 80)
+    lines.append("📈 7-Day Statistics")
+    lines.append("-" * 80)
     stats_7d = monitor.get_statistics(7)
     
     if stats_7d.get('total_runs', 0) > 0:
         success_rate = (stats_7d['successful_runs'] / stats_7d['total_runs']) * 100
-        print(f"Total Runs: {stats_7d['total_runs']}")
-        print(f"Success Rate: {success_rate:.1f}% "
-              f"({stats_7d['successful_runs']} successful, {stats_7d['failed_runs']} failed)")
-        print(f"Avg Duration: {stats_7d['avg_duration']:.1f}s")
-        print(f"Total Movies Processed: {stats_7d['total_movies_processed']}")
-        print(f"Total Shows Processed: {stats_7d['total_shows_processed']}")
-        print(f"Total API Calls: {stats_7d['total_api_calls']}")
+        lines.append(
+            f"Total Runs: {stats_7d['total_runs']}\n"
+            f"Success Rate: {success_rate:.1f}% "
+            f"({stats_7d['successful_runs']} successful, {stats_7d['failed_runs']} failed)\n"
+            f"Avg Duration: {stats_7d['avg_duration']:.1f}s\n"
+            f"Total Movies Processed: {stats_7d['total_movies_processed']}\n"
+            f"Total Shows Processed: {stats_7d['total_shows_processed']}\n"
+            f"Total API Calls: {stats_7d['total_api_calls']}"
+        )
         
         if stats_7d['total_errors'] > 0:
-            print(f"⚠️  Total Errors: {stats_7d['total_errors']}")
+            lines.append(f"⚠️  Total Errors: {stats_7d['total_errors']}")
     else:
-        print("No runs in the last 7 days.")
+        lines.append("No runs in the last 7 days.")
     
-    print()
+    lines.append("")
     
     # Error summary
-    print("⚠️  Error Summary (Last 7 Days)")
-    print("-" * 80)
+    lines.append("⚠️  Error Summary (Last 7 Days)")
+    lines.append("-" * 80)
     errors = monitor.get_error_summary(7)
     
     if not errors:
-        print("No errors recorded! 🎉\n")
+        lines.append("No errors recorded! 🎉\n")
     else:
         for error in errors:
-            print(f"❌ {error['error_type']}")
-            print(f"   Count: {error['count']}")
-            print(f"   Last: {error['last_occurrence'][:19]}")
-            print()
+            lines.append(
+                f"❌ {error['error_type']}\n"
+                f"   Count: {error['count']}\n"
+                f"   Last: {error['last_occurrence'][:19]}\n"
+            )
     
-    print("=" * 80)
+    lines.append("=" * 80)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Generate HTML report
     print("\nGenerating detailed HTML report...")
@@ -2,6 +2,7 @@ import sys, json
 from app import create_app
 
 app = create_app()
+app.config['TESTING'] = True
 client = app.test_client()
 
 resp_ok = client.post('/api/login', json={'email':'Admin@Test.com','password':'Admin'})